@@ -1 +1 @@
-__all__ = ['_address', '_breakpoint', '_error', '_functions', '_library', '_register', '_symbol']
\ No newline at end of file
+__all__ = ['_address', '_breakpoint', '_error', '_functions', '_layout', '_library', '_memory', '_pool', '_register', '_sampler', '_symbol']
\ No newline at end of file
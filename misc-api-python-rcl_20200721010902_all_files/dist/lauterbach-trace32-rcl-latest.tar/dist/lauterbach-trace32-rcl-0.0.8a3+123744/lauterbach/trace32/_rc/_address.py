@@ -1,4 +1,6 @@
+import bisect
 import ctypes
+import functools
 import re
 
 
@@ -7,12 +9,30 @@ re_addr_machine_id = '(?:(?P<machine_id>.+):::)?'
 re_addr_space_id = '(?:(?P<space_id>.+)::)?'
 re_addr_value = '(?P<value>(?:[0-9]+)|(?:0x[0-9a-fA-F]+))'
 re_addr = re.compile(r'^{}{}{}{}$'.format(re_addr_access, re_addr_machine_id, re_addr_space_id, re_addr_value))
+re_addr_range = re.compile(r'^(?P<start>.+?)(?P<operator>--|\+\+)(?P<end>(?:[0-9]+)|(?:0x[0-9a-fA-F]+))$')
 
 
+@functools.lru_cache(maxsize=4096)
+def parse_address(string):
+    """Parse an address string, results are memoized.
+
+    Returns:
+        Tuple[str, int]: (access, value), access is None if the string has no access class.
+    """
+    addr_match = re_addr.match(string)
+    if addr_match is None:
+        raise ValueError('invalid address: {}'.format(string))
+    return addr_match.group('access'), int(addr_match.group('value'), 0)
+
+
+@functools.total_ordering
 class Address:
+    """Immutable address. Addresses are hashable and ordered by access class and value."""
+    __slots__ = ('__connection', '__access', '__value')
+
     def __init__(self, connection, *, access: str = None, value: int = None, **kwargs):
         self.__connection = connection
-        self.__access = access
+        self.__access = access or None
         if value is None:
             self.__value = None
         else:
@@ -30,35 +50,268 @@ class Address:
             '' if self.__access is None else self.__access + ':',
             self.__value)
 
+    def __repr__(self):
+        return 'Address({!r})'.format(str(self))
+
+    def __eq__(self, other):
+        if not isinstance(other, Address):
+            return NotImplemented
+        return self.__access == other.access and self.__value == other.value
+
+    def __lt__(self, other):
+        if not isinstance(other, Address):
+            return NotImplemented
+        return (self.__access or '', self.__value) < (other.access or '', other.value)
+
+    def __hash__(self):
+        return hash((self.__access, self.__value))
+
+    def __add__(self, offset):
+        return Address(self.__connection, access=self.__access, value=self.__value + offset)
+
+    def __sub__(self, other):
+        if isinstance(other, Address):
+            if self.__access != other.access:
+                raise ValueError('different access classes: {} and {}'.format(self, other))
+            return self.__value - other.value
+        return Address(self.__connection, access=self.__access, value=self.__value - other)
+
     @property
     def access(self):
         return self.__access
 
-    @access.setter
-    def access(self, access):
-        self.__access = access
-
     @property
     def value(self):
         return self.__value
 
-    @value.setter
-    def value(self, value):
-        self.__value = value
-
     @staticmethod
     def from_string(connection, string):
-        addr_match = re_addr.match(string)
-        addr = Address(connection)
-        addr.access = addr_match.group('access')
-        addr.value = int(addr_match.group('value'), 0)
-        return addr
+        access, value = parse_address(string)
+        return Address(connection, access=access, value=value)
 
     def to_dualport(self):
         addr_str = self.__connection.fnc('CONVert.ADDRESSTODUALPORT({})'.format(str(self)))
         return self.from_string(self.__connection, addr_str)
 
 
+class AddressRange:
+    """Immutable range of length bytes starting at address.
+
+    A range unpacks into (address, length), so ranges can be passed wherever (address, length) tuples are expected.
+
+    Args:
+        address (Address): Start address.
+        length (int): Length in bytes, must be positive. TRACE32 cannot express an empty range.
+    """
+    __slots__ = ('__address', '__length')
+
+    def __init__(self, address, length):
+        if length <= 0:
+            raise ValueError('length must be positive: {}'.format(length))
+        self.__address = address
+        self.__length = length
+
+    def __str__(self):
+        return '{}++0x{:x}'.format(self.__address, self.__length - 1)
+
+    def __repr__(self):
+        return 'AddressRange({!r}, 0x{:x})'.format(str(self.__address), self.__length)
+
+    def __eq__(self, other):
+        if not isinstance(other, AddressRange):
+            return NotImplemented
+        return self.__address == other.address and self.__length == other.length
+
+    def __hash__(self):
+        return hash((self.__address, self.__length))
+
+    def __iter__(self):
+        # unpacks like the (address, length) entries of MemoryService.read_many()
+        return iter((self.__address, self.__length))
+
+    def __contains__(self, address):
+        return (address.access == self.__address.access
+                and self.__address.value <= address.value < self.__address.value + self.__length)
+
+    @property
+    def address(self):
+        return self.__address
+
+    @property
+    def length(self):
+        return self.__length
+
+    @property
+    def access(self):
+        return self.__address.access
+
+    @property
+    def start(self):
+        """int: First address value."""
+        return self.__address.value
+
+    @property
+    def stop(self):
+        """int: Address value after the last address."""
+        return self.__address.value + self.__length
+
+    @staticmethod
+    def from_string(connection, string):
+        """Parse a range in TRACE32 syntax, e.g. 'D:0x1000--0x1fff' or 'D:0x1000++0xfff'."""
+        range_match = re_addr_range.match(string)
+        if range_match is None:
+            raise ValueError('invalid address range: {}'.format(string))
+        address = Address.from_string(connection, range_match.group('start'))
+        end = int(range_match.group('end'), 0)
+        if range_match.group('operator') == '++':
+            return AddressRange(address, end + 1)
+        return AddressRange(address, end - address.value + 1)
+
+
+class IntervalSet:
+    """Set of integers stored as sorted, disjoint [start, stop) intervals.
+
+    Overlapping and adjacent intervals are coalesced, so the intervals of two equal sets are equal.
+
+    Args:
+        intervals (Iterable[Tuple[int, int]], optional): Initial (start, stop) intervals.
+
+    Example:
+        >>> regions = IntervalSet([(0x100, 0x200), (0x200, 0x280)])
+        >>> regions
+        IntervalSet([(0x100, 0x280)])
+        >>> regions.discard(0x140, 0x180)
+        >>> regions
+        IntervalSet([(0x100, 0x140), (0x180, 0x280)])
+        >>> 0x150 in regions, regions.total
+        (False, 320)
+    """
+    def __init__(self, intervals=()):
+        self.__starts = []
+        self.__stops = []
+        for start, stop in intervals:
+            self.add(start, stop)
+
+    def __iter__(self):
+        return iter(zip(self.__starts, self.__stops))
+
+    def __len__(self):
+        return len(self.__starts)
+
+    def __bool__(self):
+        return bool(self.__starts)
+
+    def __eq__(self, other):
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return 'IntervalSet([{}])'.format(', '.join('(0x{:x}, 0x{:x})'.format(*interval) for interval in self))
+
+    def __contains__(self, value):
+        index = bisect.bisect_right(self.__starts, value) - 1
+        return index >= 0 and value < self.__stops[index]
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    @property
+    def total(self):
+        """int: Number of integers in the set."""
+        return sum(stop - start for start, stop in self)
+
+    def copy(self):
+        result = IntervalSet()
+        result.__starts = list(self.__starts)
+        result.__stops = list(self.__stops)
+        return result
+
+    def clear(self):
+        self.__starts.clear()
+        self.__stops.clear()
+
+    def add(self, start, stop):
+        if start >= stop:
+            return
+        first = bisect.bisect_left(self.__stops, start)
+        last = bisect.bisect_right(self.__starts, stop)
+        if first < last:
+            start = min(start, self.__starts[first])
+            stop = max(stop, self.__stops[last - 1])
+        self.__starts[first:last] = [start]
+        self.__stops[first:last] = [stop]
+
+    def discard(self, start, stop):
+        if start >= stop:
+            return
+        first = bisect.bisect_right(self.__stops, start)
+        last = bisect.bisect_left(self.__starts, stop)
+        if first >= last:
+            return
+        starts = []
+        stops = []
+        if self.__starts[first] < start:
+            starts.append(self.__starts[first])
+            stops.append(start)
+        if self.__stops[last - 1] > stop:
+            starts.append(stop)
+            stops.append(self.__stops[last - 1])
+        self.__starts[first:last] = starts
+        self.__stops[first:last] = stops
+
+    def overlaps(self, start, stop):
+        if start >= stop:
+            return False
+        index = bisect.bisect_right(self.__stops, start)
+        return index < len(self.__starts) and self.__starts[index] < stop
+
+    def gaps(self, start, stop):
+        """Return the parts of [start, stop) that are not in the set."""
+        parts = []
+        index = bisect.bisect_right(self.__stops, start)
+        while index < len(self.__starts) and self.__starts[index] < stop:
+            if self.__starts[index] > start:
+                parts.append((start, self.__starts[index]))
+            start = max(start, self.__stops[index])
+            index += 1
+        if start < stop:
+            parts.append((start, stop))
+        return parts
+
+    def union(self, other):
+        result = self.copy()
+        for start, stop in other:
+            result.add(start, stop)
+        return result
+
+    def intersection(self, other):
+        result = IntervalSet()
+        intervals = list(other)
+        index = 0
+        for start, stop in self:
+            while index < len(intervals) and intervals[index][1] <= start:
+                index += 1
+            other_index = index
+            while other_index < len(intervals) and intervals[other_index][0] < stop:
+                result.__starts.append(max(start, intervals[other_index][0]))
+                result.__stops.append(min(stop, intervals[other_index][1]))
+                other_index += 1
+        return result
+
+    def difference(self, other):
+        result = self.copy()
+        for start, stop in other:
+            result.discard(start, stop)
+        return result
+
+
 class CAddress:
     def __init__(self, library):
         self.__library = library
@@ -71,7 +324,12 @@ class CAddress:
             self.value)
 
     def __del__(self):
-        self.__library.t32_releaseaddressobj(self.__obj)
+        self.release()
+
+    def release(self):
+        if self.__obj is not None:
+            self.__library.t32_releaseaddressobj(self.__obj)
+            self.__obj = None
 
     @property
     def obj(self):
@@ -103,7 +361,4 @@ class CAddress:
         return self
 
     def to_address(self, connection):
-        addr = Address(connection)
-        addr.access = self.access
-        addr.value = self.value
-        return addr
+        return Address(connection, access=self.access, value=self.value)
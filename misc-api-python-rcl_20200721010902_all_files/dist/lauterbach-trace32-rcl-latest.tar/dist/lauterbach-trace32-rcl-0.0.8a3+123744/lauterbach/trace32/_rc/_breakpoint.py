@@ -95,34 +95,35 @@ class Breakpoint:
         """Delete Breakpoint.
 
         """
-        self.__connection._set_channel()
-        c_bp = CBreakpoint(self.__connection.library).from_breakpoint(self, self.__connection.library)
-        c_bp.delete()
+        with self.__connection.locked():
+            c_bp = CBreakpoint.from_breakpoint(self, self.__connection.library)
+            c_bp.delete()
 
     def disable(self):
         """Disable breakpoint.
 
         """
-        self.__connection._set_channel()
         self.__enabled = False
-        c_bp = CBreakpoint.from_breakpoint(self, self.__connection.library)
-        c_bp.write()
+        with self.__connection.locked():
+            c_bp = CBreakpoint.from_breakpoint(self, self.__connection.library)
+            c_bp.write()
 
     def enable(self):
         """Enable breakpoint.
 
         """
         self.__enabled = True
-        c_bp = CBreakpoint.from_breakpoint(self, self.__connection.library)
-        c_bp.write()
+        with self.__connection.locked():
+            c_bp = CBreakpoint.from_breakpoint(self, self.__connection.library)
+            c_bp.write()
 
     def set(self):
         """Set Breakpoint.
 
         """
-        self.__connection._set_channel()
-        c_bp = CBreakpoint.from_breakpoint(self, self.__connection.library)
-        c_bp.write()
+        with self.__connection.locked():
+            c_bp = CBreakpoint.from_breakpoint(self, self.__connection.library)
+            c_bp.write()
         return self
 
 
@@ -133,7 +134,12 @@ class CBreakpoint:
         self.__library.t32_requestbreakpointobj(self.__obj)
 
     def __del__(self):
-        self.__library.t32_releasebreakpointobj(self.__obj)
+        self.release()
+
+    def release(self):
+        if self.__obj is not None:
+            self.__library.t32_releasebreakpointobj(self.__obj)
+            self.__obj = None
 
     @property
     def action(self):
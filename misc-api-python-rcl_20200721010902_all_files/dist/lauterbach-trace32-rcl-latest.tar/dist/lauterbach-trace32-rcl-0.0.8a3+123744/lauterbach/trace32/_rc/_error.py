@@ -40,12 +40,17 @@ class ApiBaseError(Exception):
 
 class ApiError(ApiBaseError):
     def __init__(self, error_code):
+        self.error_code = error_code
         error_details = self.__error_codes.get(error_code)
         if error_details is None:
             super().__init__('unknown error: {}'.format(error_code))
         else:
             super().__init__('{} ({}): {}'.format(error_details[0], error_code, error_details[1]))
 
+    def __reduce__(self):
+        # the message is derived from error_code, so pickle the code only
+        return type(self), (self.error_code,)
+
     __error_codes = {
         0: ("T32_OK", "Ok, no error"),
         # error codes by API client
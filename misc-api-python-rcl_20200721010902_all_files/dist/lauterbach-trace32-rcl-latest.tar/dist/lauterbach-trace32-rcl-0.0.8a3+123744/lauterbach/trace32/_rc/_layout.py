@@ -0,0 +1,158 @@
+import collections
+import struct
+
+
+# struct format characters and numpy type codes of the field types
+_FIELD_TYPES = {
+    'int8': ('b', 'i1'),
+    'uint8': ('B', 'u1'),
+    'int16': ('h', 'i2'),
+    'uint16': ('H', 'u2'),
+    'int32': ('i', 'i4'),
+    'uint32': ('I', 'u4'),
+    'int64': ('q', 'i8'),
+    'uint64': ('Q', 'u8'),
+    'float': ('f', 'f4'),
+    'double': ('d', 'f8'),
+    'bytes': ('s', 'S'),
+}
+
+_BYTEORDER_PREFIXES = {None: '=', 'little': '<', 'big': '>'}
+
+
+class Layout:
+    """Memory layout of a C struct.
+
+    The layout is compiled once into a struct.Struct and can be reused to decode any number of records.
+
+    Args:
+        fields (List[Tuple]): One (name, type, offset, count) tuple per field. type is one of 'int8', 'uint8',
+            'int16', 'uint16', 'int32', 'uint32', 'int64', 'uint64', 'float', 'double' or 'bytes'. offset (optional)
+            is the byte offset of the field in the record, it defaults to the end of the previous field. count
+            (optional) makes the field an array of count values, or the length of a 'bytes' field.
+        byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+        size (int, optional): Size of a record in bytes including trailing padding. Defaults to the end of the last
+            field.
+        name (str, optional): Name of the record type. Defaults to 'Record'.
+
+    Example:
+        >>> layout = Layout([('id', 'uint32', 0), ('flags', 'uint8', 4), ('samples', 'int16', 6, 4)], size=16)
+        >>> layout.decode(data, count=2)
+    """
+    def __init__(self, fields, *, byteorder=None, size=None, name='Record'):
+        if byteorder not in _BYTEORDER_PREFIXES:
+            raise ValueError('invalid byteorder: {}'.format(byteorder))
+        self.__byteorder = byteorder
+        self.__fields = []
+        position = 0
+        for field in fields:
+            field_name, field_type = field[0], field[1]
+            offset = field[2] if len(field) > 2 and field[2] is not None else position
+            count = field[3] if len(field) > 3 else None
+            if field_type not in _FIELD_TYPES:
+                raise ValueError('invalid type of field "{}": {}'.format(field_name, field_type))
+            field_size = struct.calcsize('=' + _FIELD_TYPES[field_type][0]) * (1 if count is None else count)
+            self.__fields.append((field_name, field_type, offset, count, field_size))
+            position = offset + field_size
+        self.__fields.sort(key=lambda field: field[2])
+        end = max((offset + field_size for _, _, offset, _, field_size in self.__fields), default=0)
+        self.__size = end if size is None else size
+        if self.__size < end:
+            raise ValueError('size {} is smaller than the fields ({} bytes)'.format(self.__size, end))
+        self.__struct, self.__slices = self.__compile()
+        self.__record_type = collections.namedtuple(name, [field[0] for field in self.__fields])
+        self.__dtype = None
+
+    def __compile(self):
+        formats = [_BYTEORDER_PREFIXES[self.__byteorder]]
+        slices = []
+        position = 0
+        value_index = 0
+        for field_name, field_type, offset, count, field_size in self.__fields:
+            if offset < position:
+                raise ValueError('field "{}" overlaps the previous field'.format(field_name))
+            if offset > position:
+                formats.append('{}x'.format(offset - position))
+            format_char = _FIELD_TYPES[field_type][0]
+            if count is None or field_type == 'bytes':
+                formats.append('{}{}'.format('' if count is None else count, format_char))
+                slices.append((value_index, None))
+                value_index += 1
+            else:
+                formats.append('{}{}'.format(count, format_char))
+                slices.append((value_index, value_index + count))
+                value_index += count
+            position = offset + field_size
+        if self.__size > position:
+            formats.append('{}x'.format(self.__size - position))
+        return struct.Struct(''.join(formats)), slices
+
+    @property
+    def size(self):
+        """int: Size of a record in bytes."""
+        return self.__size
+
+    @property
+    def names(self):
+        """List[str]: Field names ordered by offset."""
+        return [field[0] for field in self.__fields]
+
+    @property
+    def record_type(self):
+        """type: Named tuple type of the decoded records."""
+        return self.__record_type
+
+    @property
+    def dtype(self):
+        """numpy.dtype: Structured NumPy dtype of a record (requires NumPy)."""
+        if self.__dtype is None:
+            import numpy
+            prefix = _BYTEORDER_PREFIXES[self.__byteorder]
+            formats = []
+            for _, field_type, _, count, _ in self.__fields:
+                if field_type == 'bytes':
+                    formats.append('S{}'.format(1 if count is None else count))
+                elif count is None:
+                    formats.append(prefix + _FIELD_TYPES[field_type][1])
+                else:
+                    formats.append((prefix + _FIELD_TYPES[field_type][1], (count,)))
+            self.__dtype = numpy.dtype({'names': self.names, 'formats': formats,
+                                        'offsets': [field[2] for field in self.__fields], 'itemsize': self.__size})
+        return self.__dtype
+
+    def __record(self, values):
+        return self.__record_type(*[values[start] if stop is None else values[start:stop]
+                                    for start, stop in self.__slices])
+
+    def decode(self, data, count=None, *, columns=False):
+        """Decode records.
+
+        Args:
+            data (bytes): Data of at least count records.
+            count (int, optional): Number of records. If None, a single record is decoded and returned.
+            columns (bool, optional): Return a dict of field name to list of values instead of a list of records.
+
+        Returns:
+            Record, List[Record] or Dict[str, list]: Result
+        """
+        if count is None:
+            return self.__record(self.__struct.unpack_from(data))
+        view = memoryview(data)[:count * self.__size]
+        records = [self.__record(values) for values in self.__struct.iter_unpack(view)]
+        if columns:
+            values = list(zip(*records)) if records else [()] * len(self.__fields)
+            return collections.OrderedDict((name, list(column)) for name, column in zip(self.names, values))
+        return records
+
+    def decode_numpy(self, data, count=1):
+        """Decode records into a structured NumPy array (requires NumPy).
+
+        Args:
+            data (bytes): Data of at least count records.
+            count (int, optional): Number of records. Defaults to 1.
+
+        Returns:
+            numpy.ndarray: Result
+        """
+        import numpy
+        return numpy.frombuffer(data, dtype=self.dtype, count=count)
@@ -1,6 +1,7 @@
 import ctypes
 import os
 import platform
+import threading
 
 from ._error import *
 
@@ -20,6 +21,8 @@ def decorator_error(function_to_decorate):
 class Library:
     def __init__(self, t32sys):
         self.__library_handle = None
+        # serializes channel switches and API calls of all threads
+        self.__lock = threading.RLock()
 
         library_name = self.auto_detect_library_name()
         if t32sys is None:
@@ -473,7 +476,7 @@ class Library:
         self.__library_handle.T32_GetBundleObjSize.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint32)]
         self.__library_handle.T32_GetBundleObjSize.restype = ctypes.c_int
 
-        self.__library_handle.T32_GetBundleObjSyncStatusByIndex.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_uint32]
+        self.__library_handle.T32_GetBundleObjSyncStatusByIndex.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.c_uint32]
         self.__library_handle.T32_GetBundleObjSyncStatusByIndex.restype = ctypes.c_int
 
         self.__library_handle.T32_CopyDataFromBundleObjByIndex.argtypes = [ctypes.POINTER(ctypes.c_uint8), ctypes.c_int, ctypes.c_void_p, ctypes.c_uint32]
@@ -624,6 +627,11 @@ class Library:
     def library_handle(self):
         return self.__library_handle
 
+    @property
+    def lock(self):
+        """threading.RLock: Lock held while a channel is selected and used."""
+        return self.__lock
+
     @decorator_error
     def t32_config(self, *args, **kwargs):
         return self.__library_handle.T32_Config(*args, **kwargs)
@@ -0,0 +1,467 @@
+import array
+import collections
+import contextlib
+import ctypes
+import queue
+import struct
+import threading
+
+
+from ._error import *
+
+
+# estimated per-entry protocol overhead of a memory bundle in bytes
+_BUNDLE_ENTRY_OVERHEAD = 16
+
+
+def _array_typecode(size, signed):
+    for typecode in ('bhilq' if signed else 'BHILQ'):
+        if array.array(typecode).itemsize == size:
+            return typecode
+    raise ValueError('no array typecode for {} {}-byte integers'.format('signed' if signed else 'unsigned', size))
+
+
+# array.array typecodes of the typed array accessors
+ARRAY_TYPECODES = {
+    'int8': 'b',
+    'uint8': 'B',
+    'int16': _array_typecode(2, True),
+    'uint16': _array_typecode(2, False),
+    'int32': _array_typecode(4, True),
+    'uint32': _array_typecode(4, False),
+    'int64': _array_typecode(8, True),
+    'uint64': _array_typecode(8, False),
+    'float': 'f',
+    'double': 'd',
+}
+
+# precompiled formats of the scalar accessors (native byte order, standard sizes)
+SCALAR_STRUCTS = {
+    'int8': struct.Struct('=b'),
+    'uint8': struct.Struct('=B'),
+    'int16': struct.Struct('=h'),
+    'uint16': struct.Struct('=H'),
+    'int32': struct.Struct('=i'),
+    'uint32': struct.Struct('=I'),
+    'int64': struct.Struct('=q'),
+    'uint64': struct.Struct('=Q'),
+    'float': struct.Struct('=f'),
+    'double': struct.Struct('=d'),
+}
+
+
+MemoryReadResult = collections.namedtuple('MemoryReadResult', ['data', 'status'])
+MemoryCacheInfo = collections.namedtuple('MemoryCacheInfo', ['hits', 'misses', 'pages', 'max_pages', 'page_size'])
+TransferProgress = collections.namedtuple('TransferProgress', ['transferred', 'total', 'elapsed', 'throughput'])
+MemoryChange = collections.namedtuple('MemoryChange', ['address', 'old', 'new'])
+DeltaLoadResult = collections.namedtuple('DeltaLoadResult', ['blocks', 'written_blocks', 'written_bytes'])
+MemoryMismatch = collections.namedtuple('MemoryMismatch', ['address', 'expected', 'actual'])
+MemoryTestResult = collections.namedtuple('MemoryTestResult', ['passed', 'address'])
+TolerantReadResult = collections.namedtuple('TolerantReadResult', ['data', 'valid'])
+
+
+def c_uint8_array(view):
+    """Return a ctypes array of the bytes in view.
+
+    The memory of view is shared if it is writable, otherwise it is copied once.
+
+    Args:
+        view (memoryview): Contiguous memoryview with format 'B'.
+
+    Returns:
+        ctypes.Array: Array of ctypes.c_uint8.
+    """
+    if view.readonly:
+        return (ctypes.c_uint8 * len(view)).from_buffer_copy(view)
+    return (ctypes.c_uint8 * len(view)).from_buffer(view)
+
+
+def bundle_schedule(lengths, packlen):
+    """Distribute memory accesses over bundles that fit into one packet each.
+
+    Bundles are filled up, an access that does not fit into the remaining space of a bundle is split so its first
+    piece fills the bundle.
+
+    Args:
+        lengths (List[int]): Length of each access in bytes.
+        packlen (int): Remote API packet length.
+
+    Returns:
+        List[List[Tuple[int, int, int]]]: Bundles, each a list of (index, offset, length) pieces.
+
+    Example:
+        Each piece also takes 16 bytes of packet space for its header:
+
+        >>> bundle_schedule([100, 40], 64)
+        [[(0, 0, 48)], [(0, 48, 48)], [(0, 96, 4), (1, 0, 28)], [(1, 28, 12)]]
+    """
+    bundles = []
+    bundle = []
+    used = 0
+    for index, length in enumerate(lengths):
+        offset = 0
+        while offset < length:
+            space = packlen - used - _BUNDLE_ENTRY_OVERHEAD
+            if bundle and space <= 0:
+                bundles.append(bundle)
+                bundle = []
+                used = 0
+                space = packlen - _BUNDLE_ENTRY_OVERHEAD
+            piece = min(length - offset, max(space, 1))
+            bundle.append((index, offset, piece))
+            used += piece + _BUNDLE_ENTRY_OVERHEAD
+            offset += piece
+    if bundle:
+        bundles.append(bundle)
+    return bundles
+
+
+def changed_ranges(old, new, *, granularity=32):
+    """Return the ranges in which two equally long byte sequences differ.
+
+    The sequences are compared in slices of granularity bytes, only differing slices are compared byte by byte.
+    Each range is a maximal run of differing bytes, unchanged bytes are never included.
+
+    Returns:
+        List[Tuple[int, int]]: (start, stop) offsets of the changed ranges.
+
+    Example:
+        >>> changed_ranges(b'abcdef', b'aXcdYY')
+        [(1, 2), (4, 6)]
+    """
+    old = memoryview(old).cast('B')
+    new = memoryview(new).cast('B')
+    ranges = []
+    length = len(new)
+    for offset in range(0, length, granularity):
+        end = min(offset + granularity, length)
+        if old[offset:end] == new[offset:end]:
+            continue
+        index = offset
+        while index < end:
+            if old[index] == new[index]:
+                index += 1
+                continue
+            start = index
+            while index < end and old[index] != new[index]:
+                index += 1
+            if ranges and ranges[-1][1] == start:
+                # continues a run of the previous slice
+                ranges[-1] = (ranges[-1][0], index)
+            else:
+                ranges.append((start, index))
+    return ranges
+
+
+def find_pattern(data, pattern, mask=None):
+    """Return the offsets of all, possibly overlapping, occurrences of pattern in data.
+
+    Args:
+        data (bytes-like): Data to search.
+        pattern (bytes): Pattern to search for.
+        mask (bytes, optional): Bit mask per pattern byte, bits that are 0 are ignored. Masked searches are
+            vectorized with NumPy if it is installed.
+
+    Returns:
+        List[int]: Offsets in ascending order.
+    """
+    if mask is None:
+        data = bytes(data)
+        offsets = []
+        offset = data.find(pattern)
+        while offset >= 0:
+            offsets.append(offset)
+            offset = data.find(pattern, offset + 1)
+        return offsets
+    count = len(data) - len(pattern) + 1
+    if count <= 0:
+        return []
+    try:
+        import numpy
+    except ImportError:
+        data = bytes(data)
+        masked = [(index, value & bits, bits) for index, (value, bits) in enumerate(zip(pattern, mask)) if bits]
+        return [offset for offset in range(count)
+                if all(data[offset + index] & bits == value for index, value, bits in masked)]
+    values = numpy.frombuffer(data, dtype=numpy.uint8)
+    matches = numpy.ones(count, dtype=bool)
+    for index, (value, bits) in enumerate(zip(pattern, mask)):
+        matches &= (values[index:index + count] & bits) == (value & bits)
+    return numpy.flatnonzero(matches).tolist()
+
+
+class MemorySnapshot:
+    """Content of a memory region and the debugger's CRC32 checksum of each block.
+
+    Args:
+        address (Address): Start address.
+        data (bytearray): Content of the region.
+        block_size (int): Size of the checksum blocks in bytes.
+        checksums (List[int]): Checksum of each block.
+    """
+    def __init__(self, address, data, block_size, checksums):
+        self.__address = address
+        self.__data = data
+        self.__block_size = block_size
+        self.__checksums = checksums
+
+    @property
+    def address(self):
+        return self.__address
+
+    @property
+    def length(self):
+        return len(self.__data)
+
+    @property
+    def data(self):
+        return self.__data
+
+    @property
+    def block_size(self):
+        return self.__block_size
+
+    @property
+    def checksums(self):
+        return self.__checksums
+
+
+class CBuffer:
+    def __init__(self, library, size):
+        self.__library = library
+        self.__obj = ctypes.c_void_p()
+        self.__size = size
+        self.__library.t32_requestbufferobj(self.__obj, size)
+
+    def __del__(self):
+        self.release()
+
+    def release(self):
+        if self.__obj is not None:
+            self.__library.t32_releasebufferobj(self.__obj)
+            self.__obj = None
+
+    @property
+    def obj(self):
+        return self.__obj
+
+    @property
+    def size(self):
+        return self.__size
+
+    def resize(self, size):
+        if size > self.__size:
+            self.__library.t32_resizebufferobj(self.__obj, size)
+            self.__size = size
+
+    def storage(self):
+        c_storage = ctypes.POINTER(ctypes.c_uint8)()
+        self.__library.t32_getbufferobjstoragepointer(c_storage, self.__obj)
+        return c_storage
+
+    def to_bytes(self, length):
+        return ctypes.string_at(self.storage(), length)
+
+    def copy_to(self, buffer, length):
+        c_buffer = (ctypes.c_uint8 * length).from_buffer(buffer)
+        self.__library.t32_copydatafrombufferobj(c_buffer, length, self.__obj)
+
+    def copy_from(self, view):
+        self.__library.t32_copydatatobufferobj(self.__obj, len(view), c_uint8_array(view))
+
+
+class CBufferPool:
+    """Pool of reusable buffer objects.
+
+    Buffer objects are resized instead of being requested again when a larger buffer is needed. close() releases all
+    pooled buffers, buffers checked out at that time are released when they are returned.
+    """
+    def __init__(self, library):
+        self.__library = library
+        self.__free = []
+        self.__leased = {}  # id -> checked out buffer
+        self.__stale = set()  # ids of buffers checked out before close()
+
+    def acquire(self, size):
+        if self.__free:
+            c_buffer = self.__free.pop()
+            c_buffer.resize(size)
+        else:
+            c_buffer = CBuffer(self.__library, size)
+        self.__leased[id(c_buffer)] = c_buffer
+        return c_buffer
+
+    def release(self, c_buffer):
+        del self.__leased[id(c_buffer)]
+        if id(c_buffer) in self.__stale:
+            self.__stale.discard(id(c_buffer))
+            c_buffer.release()
+        else:
+            self.__free.append(c_buffer)
+
+    @contextlib.contextmanager
+    def buffer(self, size):
+        c_buffer = self.acquire(size)
+        try:
+            yield c_buffer
+        finally:
+            self.release(c_buffer)
+
+    def close(self):
+        while self.__free:
+            self.__free.pop().release()
+        self.__stale.update(self.__leased)
+
+
+class MemoryCache:
+    """LRU cache of target memory pages keyed by (access class, page address)."""
+    def __init__(self, *, page_size=4096, max_pages=1024):
+        if page_size <= 0 or max_pages <= 0:
+            raise ValueError('page_size and max_pages must be positive')
+        self.__page_size = page_size
+        self.__max_pages = max_pages
+        self.__pages = collections.OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def page_size(self):
+        return self.__page_size
+
+    @property
+    def max_pages(self):
+        return self.__max_pages
+
+    def info(self):
+        return MemoryCacheInfo(self.__hits, self.__misses, len(self.__pages), self.__max_pages, self.__page_size)
+
+    def get(self, access, page):
+        data = self.__pages.get((access, page))
+        if data is None:
+            self.__misses += 1
+        else:
+            self.__hits += 1
+            self.__pages.move_to_end((access, page))
+        return data
+
+    def put(self, access, page, data):
+        self.__pages[(access, page)] = data
+        self.__pages.move_to_end((access, page))
+        while len(self.__pages) > self.__max_pages:
+            self.__pages.popitem(last=False)
+
+    def invalidate(self):
+        self.__pages.clear()
+
+    def invalidate_range(self, start, length):
+        """Drop the pages overlapping [start, start + length) of every access class.
+
+        Access classes may alias the same memory, e.g. a write to 'D:0x100' changes what '0x100' reads.
+        """
+        first_page = start - start % self.__page_size
+        for key in [key for key in self.__pages if first_page <= key[1] < start + length]:
+            del self.__pages[key]
+
+
+class CMemoryBundle:
+    def __init__(self, library, size=0):
+        self.__library = library
+        self.__obj = ctypes.c_void_p()
+        self.__library.t32_requestmemorybundleobj(self.__obj, size)
+        # address objects and data buffers must stay alive until the bundle is transferred
+        self.__references = []
+
+    def __del__(self):
+        self.release()
+
+    def release(self):
+        if self.__obj is not None:
+            self.__library.t32_releasememorybundleobj(self.__obj)
+            self.__obj = None
+        self.__references.clear()
+
+    @property
+    def obj(self):
+        return self.__obj
+
+    @property
+    def size(self):
+        c_size = ctypes.c_uint32()
+        self.__library.t32_getbundleobjsize(self.__obj, c_size)
+        return c_size.value
+
+    def add_read(self, c_address, length):
+        self.__library.t32_addtobundleobjaddrlength(self.__obj, c_address.obj, length)
+        self.__references.append(c_address)
+
+    def add_write(self, c_address, data):
+        c_data = c_uint8_array(data)
+        self.__library.t32_addtobundleobjaddrlengthbytearray(self.__obj, c_address.obj, len(data), c_data)
+        self.__references.append(c_address)
+        self.__references.append(c_data)
+
+    def transfer(self):
+        """Transfer the bundle.
+
+        A failed transfer of single entries is not raised, the entries' status has to be checked with sync_status().
+        """
+        try:
+            self.__library.t32_transfermemorybundleobj(self.__obj)
+        except ApiError as e:
+            if e.error_code != 0x1072:  # T32_ERR_TRANSFERMEMOBJ_TRANSFERFAIL
+                raise
+        self.__references.clear()
+
+    def sync_status(self, index):
+        c_status = ctypes.c_int()
+        self.__library.t32_getbundleobjsyncstatusbyindex(self.__obj, c_status, index)
+        return c_status.value
+
+    def copy_data(self, index, buffer, offset, length):
+        c_buffer = (ctypes.c_uint8 * length).from_buffer(buffer, offset)
+        self.__library.t32_copydatafrombundleobjbyindex(c_buffer, length, self.__obj, index)
+
+
+class FileWriterThread(threading.Thread):
+    """Writes chunks to a file in the background while the next chunk is transferred.
+
+    At most `depth` chunks are allocated, so memory use is bounded independent of the file size.
+    """
+    def __init__(self, file, chunk_size, *, depth=3):
+        super().__init__(daemon=True)
+        self.__file = file
+        self.__free = queue.Queue()
+        self.__pending = queue.Queue()
+        self.__error = None
+        for _ in range(depth):
+            self.__free.put(bytearray(chunk_size))
+
+    def run(self):
+        while True:
+            item = self.__pending.get()
+            if item is None:
+                break
+            buffer, length = item
+            try:
+                if self.__error is None:
+                    self.__file.write(memoryview(buffer)[:length])
+            except Exception as e:
+                self.__error = e
+            self.__free.put(buffer)
+
+    def get_buffer(self):
+        """Return a free chunk buffer, blocks until the writer has released one."""
+        self.check()
+        return self.__free.get()
+
+    def put(self, buffer, length):
+        self.__pending.put((buffer, length))
+
+    def close(self):
+        self.__pending.put(None)
+        self.join()
+        self.check()
+
+    def check(self):
+        if self.__error is not None:
+            raise self.__error
@@ -0,0 +1,53 @@
+import contextlib
+
+
+class CObjectPool:
+    """Pool of reusable API objects (CAddress, CBreakpoint).
+
+    Objects are requested from the API once and reused. close() releases all pooled objects, objects checked out
+    at that time are released when they are returned.
+
+    Args:
+        factory (Callable[[], object]): Requests a new object, the object must have a release() method.
+    """
+    def __init__(self, factory):
+        self.__factory = factory
+        self.__free = []
+        self.__leased = {}  # id -> checked out object
+        self.__stale = set()  # ids of objects checked out before close()
+        self.__allocated = 0
+
+    @property
+    def allocated(self):
+        """int: Number of objects requested from the API."""
+        return self.__allocated
+
+    def acquire(self):
+        if self.__free:
+            c_object = self.__free.pop()
+        else:
+            self.__allocated += 1
+            c_object = self.__factory()
+        self.__leased[id(c_object)] = c_object
+        return c_object
+
+    def release(self, c_object):
+        del self.__leased[id(c_object)]
+        if id(c_object) in self.__stale:
+            self.__stale.discard(id(c_object))
+            c_object.release()
+        else:
+            self.__free.append(c_object)
+
+    @contextlib.contextmanager
+    def object(self):
+        c_object = self.acquire()
+        try:
+            yield c_object
+        finally:
+            self.release(c_object)
+
+    def close(self):
+        while self.__free:
+            self.__free.pop().release()
+        self.__stale.update(self.__leased)
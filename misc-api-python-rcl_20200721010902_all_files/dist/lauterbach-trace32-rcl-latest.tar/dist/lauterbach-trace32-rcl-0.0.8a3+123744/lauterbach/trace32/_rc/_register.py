@@ -103,8 +103,9 @@ class Register:
 
 
 class RegisterService:
-    def __init__(self, intf):
+    def __init__(self, intf, *, on_write=None):
         self.__intf = intf
+        self.__on_write = on_write
 
     def __call__(self, *args, **kwargs):
         return Register(self.__intf, *args, **kwargs)
@@ -434,4 +435,6 @@ class RegisterService:
         registers = self.__read_write_exp(data=data)
         if not registers:
             registers = self.__read_write_exp(data=data)
+        if self.__on_write is not None:
+            self.__on_write()
         return registers
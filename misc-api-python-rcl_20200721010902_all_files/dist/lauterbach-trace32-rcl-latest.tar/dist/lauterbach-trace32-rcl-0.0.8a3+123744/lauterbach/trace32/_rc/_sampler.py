@@ -0,0 +1,193 @@
+import array
+import collections
+import threading
+import time
+
+
+SamplerData = collections.namedtuple('SamplerData', ['timestamps', 'data'])
+SamplerStats = collections.namedtuple('SamplerStats', ['samples', 'rate', 'overruns', 'dropped', 'errors'])
+
+
+class Sampler:
+    """Samples memory regions periodically on a background thread.
+
+    Each tick reads all regions with one bundled read (MemoryService.read_many) and stores a record, the
+    concatenation of the regions' data, together with a time.perf_counter() timestamp in a preallocated ring
+    buffer. Use addresses converted with Address.to_dualport() to sample while the target is running.
+
+    Args:
+        connection (Debugger): Debugger to sample from.
+        entries (List[Tuple[Address, int]]): Address and length in bytes of each region.
+        rate (float): Target sample rate in Hz.
+        capacity (int, optional): Number of records in the ring buffer. When the buffer is full the oldest record is
+            overwritten and counted as dropped. Defaults to 4096.
+
+    Example:
+        >>> with Sampler(dbg, [(addr_a, 4), (addr_b, 4)], rate=1000.0) as sampler:
+        ...     time.sleep(1.0)
+        ...     timestamps, data = sampler.drain()
+        >>> records = layout.decode(data, len(timestamps))
+    """
+    def __init__(self, connection, entries, *, rate, capacity=4096):
+        if rate <= 0.0 or capacity <= 0:
+            raise ValueError('rate and capacity must be positive')
+        self.__connection = connection
+        self.__entries = list(entries)
+        self.__record_size = sum(length for _, length in self.__entries)
+        self.__period = 1.0 / rate
+        self.__capacity = capacity
+        self.__data = bytearray(capacity * self.__record_size)
+        self.__timestamps = array.array('d', [0.0]) * capacity
+        self.__head = 0  # index of the next record to write
+        self.__count = 0  # number of unread records
+        self.__lock = threading.Lock()
+        self.__stop_event = threading.Event()
+        self.__thread = None
+        self.__error = None
+        self.__samples = 0
+        self.__overruns = 0
+        self.__dropped = 0
+        self.__errors = 0
+        self.__start_time = None
+        self.__stop_time = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # do not replace an exception raised in the block by the one of the sampling thread
+        self.__join()
+        if exc_type is None:
+            self.__raise_error()
+
+    @property
+    def record_size(self):
+        """int: Size of a record in bytes."""
+        return self.__record_size
+
+    @property
+    def error(self):
+        """Exception: Exception that stopped the sampling thread, None if there was none."""
+        return self.__error
+
+    def start(self):
+        if self.__thread is not None:
+            raise RuntimeError('sampler already started')
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__start_time = time.perf_counter()
+        self.__stop_time = None
+        self.__thread.start()
+
+    def stop(self):
+        """Stop sampling.
+
+        Raises:
+            Exception: The exception that stopped the sampling thread, if any. The records sampled before remain
+                available.
+        """
+        self.__join()
+        self.__raise_error()
+
+    def __join(self):
+        if self.__thread is None:
+            return
+        self.__stop_event.set()
+        self.__thread.join()
+        self.__thread = None
+        self.__stop_time = time.perf_counter()
+
+    def __raise_error(self):
+        if self.__error is not None:
+            raise self.__error
+
+    def __run(self):
+        next_tick = time.perf_counter()
+        try:
+            while not self.__stop_event.is_set():
+                timestamp = time.perf_counter()
+                results = self.__connection.memory.read_many(self.__entries)
+                self.__store(timestamp, results)
+                next_tick += self.__period
+                now = time.perf_counter()
+                if now > next_tick:
+                    # missed deadline, skip the ticks that are already over
+                    missed = int((now - next_tick) / self.__period) + 1
+                    self.__overruns += missed
+                    next_tick += missed * self.__period
+                self.__stop_event.wait(next_tick - now)
+        except Exception as e:
+            self.__error = e
+
+    def __store(self, timestamp, results):
+        with self.__lock:
+            offset = self.__head * self.__record_size
+            for result, (_, length) in zip(results, self.__entries):
+                if result.status != 0:
+                    self.__errors += 1
+                    self.__data[offset:offset + length] = bytes(length)
+                else:
+                    self.__data[offset:offset + length] = result.data
+                offset += length
+            self.__timestamps[self.__head] = timestamp
+            self.__head = (self.__head + 1) % self.__capacity
+            if self.__count == self.__capacity:
+                self.__dropped += 1
+            else:
+                self.__count += 1
+            self.__samples += 1
+
+    def __copy(self, count):
+        """Copy the oldest count unread records, requires the lock."""
+        first = (self.__head - self.__count) % self.__capacity
+        indices = [(first, min(first + count, self.__capacity))]
+        if first + count > self.__capacity:
+            indices.append((0, first + count - self.__capacity))
+        timestamps = array.array('d')
+        data = bytearray()
+        for start, stop in indices:
+            timestamps.extend(self.__timestamps[start:stop])
+            data += self.__data[start * self.__record_size:stop * self.__record_size]
+        return SamplerData(timestamps, bytes(data))
+
+    def snapshot(self):
+        """Return the unread records without removing them. Sampling continues.
+
+        Returns:
+            SamplerData: (timestamps, data) with timestamps as array.array('d') and data as the concatenated records.
+        """
+        with self.__lock:
+            return self.__copy(self.__count)
+
+    def drain(self, max_count=None):
+        """Return and remove the unread records. Sampling continues.
+
+        Args:
+            max_count (int, optional): Maximum number of records to return, the oldest first.
+
+        Returns:
+            SamplerData: (timestamps, data) with timestamps as array.array('d') and data as the concatenated records.
+        """
+        with self.__lock:
+            count = self.__count if max_count is None else min(max_count, self.__count)
+            result = self.__copy(count)
+            self.__count -= count
+            return result
+
+    def stats(self):
+        """Sampling statistics.
+
+        Returns:
+            SamplerStats: (samples, rate, overruns, dropped, errors). rate is the achieved sample rate in Hz,
+            overruns the number of missed ticks, dropped the number of records overwritten before being read and
+            errors the number of failed region reads.
+        """
+        with self.__lock:
+            samples = self.__samples
+        if self.__start_time is None:
+            rate = 0.0
+        else:
+            elapsed = (self.__stop_time or time.perf_counter()) - self.__start_time
+            rate = samples / elapsed if elapsed > 0.0 else 0.0
+        return SamplerStats(samples, rate, self.__overruns, self.__dropped, self.__errors)
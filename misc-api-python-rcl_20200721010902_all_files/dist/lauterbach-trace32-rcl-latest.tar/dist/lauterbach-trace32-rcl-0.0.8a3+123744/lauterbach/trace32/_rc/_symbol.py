@@ -73,17 +73,26 @@ class CSymbol:
         self.__library.t32_requestsymbolobj(self.__obj)
 
     def __del__(self):
-        self.__library.t32_releasesymbolobj(self.__obj)
+        self.release()
+
+    def release(self):
+        if self.__obj is not None:
+            self.__library.t32_releasesymbolobj(self.__obj)
+            self.__obj = None
 
     @property
     def address(self):
-        c_addr = CAddress(self.__library)
-        self.__library.t32_getsymbolobjaddress(self.__obj, c_addr.obj)
-        return c_addr
+        return self.get_address(CAddress(self.__library))
 
     @address.setter
     def address(self, address):
-        c_addr = CAddress(self.__library).from_address(address)
+        self.set_address(CAddress(self.__library).from_address(address))
+
+    def get_address(self, c_addr):
+        self.__library.t32_getsymbolobjaddress(self.__obj, c_addr.obj)
+        return c_addr
+
+    def set_address(self, c_addr):
         self.__library.t32_setsymbolobjaddress(self.__obj, c_addr.obj)
 
     @property
@@ -122,9 +131,11 @@ class CSymbol:
     def obj(self):
         return self.__obj
 
-    def to_symbol(self, connection):
+    def to_symbol(self, connection, c_addr=None):
         sym = Symbol(connection)
-        sym.address = self.address.to_address(connection)
+        if c_addr is None:
+            c_addr = CAddress(self.__library)
+        sym.address = self.get_address(c_addr).to_address(connection)
         sym.name = self.name
         sym.path = self.path
         sym.size = self.size
@@ -140,37 +151,39 @@ class CSymbol:
             library = self.__connection.library
             if library is None:
                 raise ValueError()  # TODO better error and error message
-            try:
-                connection._set_channel()
-                c_symbol = ctypes.c_void_p()
-                library.t32_requestsymbolobj(c_symbol)
-                c_address = c_address_obj(library, self.__address)
-                # # TODO move this part to Address class?
-                # c_address = ctypes.c_void_p()
-                # library.t32_requestaddressobj(c_address)
-                # library.t32_setaddressobjaccessstring(c_address, self.__address.access.encode())
-                # library.t32_setaddressobjaddr64(c_address, self.__address.value)
-                # # TODO until here
-                library.t32_setsymbolobjaddress(c_symbol, c_address)
-                library.t32_querysymbolobj(c_symbol)
-                self.name = self._csymbol_get_name(library, c_symbol)
-            finally:
-                library.t32_releasesymbolobj(c_symbol)
+            # the channel must stay selected for the whole sequence of calls
+            with connection.locked():
+                try:
+                    c_symbol = ctypes.c_void_p()
+                    library.t32_requestsymbolobj(c_symbol)
+                    c_address = c_address_obj(library, self.__address)
+                    # # TODO move this part to Address class?
+                    # c_address = ctypes.c_void_p()
+                    # library.t32_requestaddressobj(c_address)
+                    # library.t32_setaddressobjaccessstring(c_address, self.__address.access.encode())
+                    # library.t32_setaddressobjaddr64(c_address, self.__address.value)
+                    # # TODO until here
+                    library.t32_setsymbolobjaddress(c_symbol, c_address)
+                    library.t32_querysymbolobj(c_symbol)
+                    self.name = self._csymbol_get_name(library, c_symbol)
+                finally:
+                    library.t32_releasesymbolobj(c_symbol)
         else:  # if self.__address is None:
             library = connection.library
             if library is None:
                 raise ValueError()  # TODO better error and error message
-            try:
-                connection._set_channel()
-                c_symbol = ctypes.c_void_p()
-                library.t32_requestsymbolobj(c_symbol)
-                library.t32_setsymbolobjname(c_symbol, self.__name.encode())
-                library.t32_querysymbolobj(c_symbol)
-                c_address = CAddress(library)
-                library.t32_getsymbolobjaddress(c_symbol, c_address.obj)
-                self.__address = c_address.to_address()
-            finally:
-                library.t32_releasesymbolobj(c_symbol)
+            # the channel must stay selected for the whole sequence of calls
+            with connection.locked():
+                try:
+                    c_symbol = ctypes.c_void_p()
+                    library.t32_requestsymbolobj(c_symbol)
+                    library.t32_setsymbolobjname(c_symbol, self.__name.encode())
+                    library.t32_querysymbolobj(c_symbol)
+                    c_address = CAddress(library)
+                    library.t32_getsymbolobjaddress(c_symbol, c_address.obj)
+                    self.__address = c_address.to_address()
+                finally:
+                    library.t32_releasesymbolobj(c_symbol)
 
 # end-of-file
 
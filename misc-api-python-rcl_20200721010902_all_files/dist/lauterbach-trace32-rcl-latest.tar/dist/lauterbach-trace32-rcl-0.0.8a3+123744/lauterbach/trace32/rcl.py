@@ -1,8 +1,15 @@
+import array
+import asyncio
 import collections
+import concurrent.futures
+import contextlib
 import ctypes
 import decimal
 import enum
+import functools
+import json
 import logging
+import random
 import re
 import struct
 import sys
@@ -10,15 +17,20 @@ import threading
 import typing
 import time
 import uuid
+import zlib
 
 
 from ._rc._address import *
 from ._rc._breakpoint import *
 from ._rc._error import *
 from ._rc._functions import *
+from ._rc._layout import *
 from ._rc._library import *
+from ._rc._memory import *
+from ._rc._pool import *
 from ._rc._practice import *
 from ._rc._register import *
+from ._rc._sampler import *
 from ._rc._symbol import *
 
 
@@ -165,16 +177,14 @@ def init(**kwargs):
         t32sys (str, optional, default=None): TRACE32 system directory. Defaults to None
     """
     print('RCL version: {}+{}'.format(VERSION, BUILD))
+    _init_library(kwargs.get('t32sys'))
+
+
+def _init_library(t32sys):
     global __t32sys
     global _library
-    if 't32sys' in kwargs:
-        t32sys = kwargs['t32sys']
-        _library = Library(t32sys)
-        __t32sys = t32sys
-    else:
-        t32sys = None
-        _library = Library(t32sys)
-        __t32sys = t32sys
+    _library = Library(t32sys)
+    __t32sys = t32sys
 
 
 # callback_function_type = ctypes.CFUNCTYPE(ctypes.c_int)
@@ -194,29 +204,183 @@ def callback_function(p0, p1, p2):
 c_callback_function = callback_function_type(callback_function)
 
 
-def connect(*, node='localhost', port=20000, packlen=1024, timeout=10.0):
+# packet lengths benchmarked by Debugger.tune()
+PACKLEN_CANDIDATES = (512, 1024, 2048, 4096, 8192)
+
+PacklenBenchmark = collections.namedtuple('PacklenBenchmark', ['packlen', 'roundtrip', 'throughput'])
+
+
+class ConnectStrategy:
+    """Retry policy for establishing a connection.
+
+    Failed attempts are retried after an exponentially growing delay with random jitter, so waiting for a booting
+    TRACE32 instance does not busy-loop and several clients do not retry in lockstep.
+
+    Args:
+        timeout (float, optional): Seconds after which no further attempt is started. None retries without time
+            limit. Defaults to 10.0.
+        max_attempts (int, optional): Maximum number of attempts. Defaults to no limit.
+        initial_delay (float, optional): Delay after the first failed attempt in seconds. Defaults to 0.05.
+        max_delay (float, optional): Upper bound of the delay in seconds. Defaults to 2.0.
+        multiplier (float, optional): Factor the delay grows by per failed attempt. Defaults to 2.0.
+        jitter (float, optional): Fraction of the delay that is randomized, between 0.0 and 1.0. Defaults to 0.5.
+
+    Example:
+        >>> dbg = connect(port=20000, strategy=ConnectStrategy(timeout=None, max_attempts=20))
+    """
+    def __init__(self, *, timeout=10.0, max_attempts=None, initial_delay=0.05, max_delay=2.0, multiplier=2.0,
+                 jitter=0.5):
+        if max_attempts is not None and max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+        if not 0.0 <= jitter <= 1.0:
+            raise ValueError('jitter must be between 0.0 and 1.0')
+        self.__timeout = timeout
+        self.__max_attempts = max_attempts
+        self.__initial_delay = initial_delay
+        self.__max_delay = max_delay
+        self.__multiplier = multiplier
+        self.__jitter = jitter
+
+    def __repr__(self):
+        return 'ConnectStrategy(timeout={}, max_attempts={}, initial_delay={}, max_delay={}, multiplier={}, ' \
+               'jitter={})'.format(self.__timeout, self.__max_attempts, self.__initial_delay, self.__max_delay,
+                                   self.__multiplier, self.__jitter)
+
+    @property
+    def timeout(self):
+        """float: Seconds after which no further attempt is started, None for no limit."""
+        return self.__timeout
+
+    @property
+    def max_attempts(self):
+        """int: Maximum number of attempts, None for no limit."""
+        return self.__max_attempts
+
+    def delay(self, attempt):
+        """Delay in seconds after the failed attempt with the given zero-based index."""
+        delay = self.__initial_delay
+        for _ in range(attempt):
+            # stop growing at max_delay, so unlimited retries cannot overflow
+            if delay >= self.__max_delay:
+                break
+            delay *= self.__multiplier
+        delay = min(delay, self.__max_delay)
+        return delay * (1.0 - self.__jitter * random.random())
+
+    def retry(self, attempts, elapsed):
+        """Whether another attempt may be started after attempts failed attempts and elapsed seconds."""
+        if self.__max_attempts is not None and attempts >= self.__max_attempts:
+            return False
+        return self.__timeout is None or elapsed < self.__timeout
+
+
+def connect(*, node='localhost', port=20000, packlen=1024, timeout=10.0, tune_address=None, strategy=None):
     """Connect to a debugger.
 
     Args:
         node (str): Remote API node. Defaults to 'localhost'.
         port (:obj:`int`): Remote API port. Defaults to 20000.
-        packlen (:obj:`int`): Remote API packet length. Defaults to 1024.
+        packlen (:obj:`int` or str): Remote API packet length or 'auto' to select the fastest of
+            PACKLEN_CANDIDATES with Debugger.tune(). Defaults to 1024.
         timeout (:obj:`float`): Connection establishment timeout in seconds. Defaults to 10.0.
+        tune_address (Address or str, optional): Readable memory to benchmark if packlen is 'auto'. Without it only
+            function round trips are benchmarked.
+        strategy (ConnectStrategy, optional): Retry policy of connection establishment. Replaces timeout. Defaults
+            to ConnectStrategy(timeout=timeout).
 
     Return:
         Debugger: debugger
     """
-    return Debugger(node=node, port=port, packlen=packlen, timeout=timeout)
+    return Debugger(node=node, port=port, packlen=packlen, timeout=timeout, tune_address=tune_address,
+                    strategy=strategy)
+
+
+ConnectResult = collections.namedtuple('ConnectResult', ['endpoint', 'debugger', 'exception'])
+
+
+def connect_many(endpoints, *, packlen=1024, strategy=None, max_workers=None):
+    """Connect to several debuggers concurrently.
+
+    Connections are established by a thread pool and yielded as soon as they are ready, so work on the first
+    debuggers can start while slower TRACE32 instances are still booting. API calls of the attempts are serialized
+    by the library lock, the waits between attempts overlap.
+
+    Args:
+        endpoints (Iterable[Tuple[str, int]]): (node, port) of each TRACE32 instance.
+        packlen (int, optional): Remote API packet length. Defaults to 1024.
+        strategy (ConnectStrategy, optional): Retry policy of each connection. Defaults to ConnectStrategy().
+        max_workers (int, optional): Maximum number of concurrent connection attempts. Defaults to one per endpoint.
+
+    Yields:
+        ConnectResult: (endpoint, debugger, exception) in order of completion. debugger is None if the connection
+        failed, exception is None on success.
+
+    Example:
+        >>> for endpoint, dbg, error in connect_many([('localhost', 20000 + i) for i in range(8)]):
+        ...     if error is None:
+        ...         dbg.cmd('Go')
+    """
+    endpoints = [tuple(endpoint) for endpoint in endpoints]
+    if not endpoints:
+        return
+    if strategy is None:
+        strategy = ConnectStrategy()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or len(endpoints))
+    futures = {executor.submit(connect, node=node, port=port, packlen=packlen, strategy=strategy): (node, port)
+               for node, port in endpoints}
+    yielded = set()
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            yielded.add(future)
+            try:
+                yield ConnectResult(futures[future], future.result(), None)
+            except Exception as e:
+                yield ConnectResult(futures[future], None, e)
+    finally:
+        # the caller stopped early: cancel pending connects and close the ones that were never yielded
+        for future in futures:
+            if future not in yielded and not future.cancel():
+                future.add_done_callback(_disconnect_unclaimed)
+        executor.shutdown(wait=False)
+
+
+def _disconnect_unclaimed(future):
+    if future.cancelled() or future.exception() is not None:
+        return
+    try:
+        future.result().disconnect()
+    except ApiBaseError as e:
+        logging.debug('disconnect failed: {}'.format(e))
+
+
+def _locked(method):
+    """Run a Debugger method while holding the lock of its library.
+
+    The lock keeps other threads from switching the channel between _set_channel() and the API calls.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.library.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class Debugger:
     """Connect to a debugger.
 
+    All methods may be called from several threads, API calls of different threads and debuggers are serialized.
+    Use locked() to run a sequence of calls without calls of other threads in between.
+
     Args:
         node (str): Remote API node. Defaults to 'localhost'.
         port (:obj:`int`): Remote API port. Defaults to 20000.
-        packlen (:obj:`int`): Remote API packet length. Defaults to 1024.
+        packlen (:obj:`int` or str): Remote API packet length or 'auto' to select the fastest of
+            PACKLEN_CANDIDATES with tune(). Defaults to 1024.
         timeout (:obj:`float`): Connection establishment timeout in seconds. Defaults to 10.0.
+        tune_address (Address or str, optional): Readable memory to benchmark if packlen is 'auto'. Without it only
+            function round trips are benchmarked.
+        strategy (ConnectStrategy, optional): Retry policy of connection establishment. Replaces timeout. Defaults
+            to ConnectStrategy(timeout=timeout).
 
     Attributes:
         address (AddressService): :py:attr:`AddressService<lauterbach.trace32.rcl.connect.AddressService>` for this debugger.
@@ -229,38 +393,42 @@ class Debugger:
         variable (VariableService): :py:attr:`VariableService<lauterbach.trace32.rcl.connect.VariableService>` for this debugger.
     """
 
-    def __init__(self, *, node='localhost', port=20000, packlen=1024, timeout=10.0):
+    def __init__(self, *, node='localhost', port=20000, packlen=1024, timeout=10.0, tune_address=None,
+                 strategy=None):
         global _library
         if _library is None:
             raise ValueError('"init()" required before "connect()"')
         self.__library = _library
         self.__channel = None
+        auto_packlen = packlen == 'auto'
+        if auto_packlen:
+            packlen = 1024
+        self.__packlen = packlen
+        self.__packlen_benchmarks = None
+        self.__strategy = ConnectStrategy(timeout=timeout) if strategy is None else strategy
+        self.__buffer_pool = CBufferPool(self.__library)
+        # reusable API objects, released on disconnect
+        self.__address_pool = CObjectPool(lambda: CAddress(self.__library))
+        self.__breakpoint_pool = CObjectPool(lambda: CBreakpoint(self.__library))
+        self.__memory_cache = None
+        self.__memory_cache_check_state = False
+        # a PRACTICE script started by cmm(timeout=None) may still change memory
+        self.__memory_cache_check_practice = False
+        # regions that failed in memory_read_tolerant per access class
+        self.__invalid_regions = {}
+        # block checksums of the last image written by memory_load_delta per (access, address)
+        self.__load_manifests = {}
         self.f = GenericFunctions(self)
         channel_size = self.__library.get_handle().T32_GetChannelSize()
         channel = (ctypes.c_char * channel_size)()
-        self.__library.get_handle().T32_GetChannelDefaults(ctypes.byref(channel))
-        self.__library.get_handle().T32_SetChannel(ctypes.byref(channel))
-        self.__library.t32_config(b"NODE=", node.encode())
-        self.__library.t32_config(b"PORT=", str(port).encode())
-        self.__library.t32_config(b"PACKLEN=", str(packlen).encode())
-        # t32_init and t32_attach with optional timeout
-        if timeout is not None:
-            timeout_start = time.perf_counter()
-        while True:
-            self.__library.t32_init()
-            self.__library.t32_exit()
-            try:
-                self.__library.t32_init()
-                self.__library.t32_attach(1)  # 1 == T32_DEV_ICD
-            except ApiReceiveFail:
-                if timeout is not None:
-                    print(time.perf_counter() - timeout_start)
-                    if time.perf_counter() - timeout_start > timeout:
-                        raise TimeoutError(time.perf_counter() - timeout_start)
-                self.__library.t32_exit()
-                continue
-            break
+        with self.__library.lock:
+            self.__library.get_handle().T32_GetChannelDefaults(ctypes.byref(channel))
+            self.__library.get_handle().T32_SetChannel(ctypes.byref(channel))
+            self.__library.t32_config(b"NODE=", node.encode())
+            self.__library.t32_config(b"PORT=", str(port).encode())
+            self.__library.t32_config(b"PACKLEN=", str(packlen).encode())
         self.__channel = channel
+        self.__attach()
         self.__event_service = None
         self.address = self.AddressService(self)
         self.breakpoint = self.BreakpointService(self)
@@ -268,9 +436,47 @@ class Debugger:
         self.fnc = self.FunctionService(self)
         self.memory = self.MemoryService(self)
         self.practice = PracticeService(self.t32_exp)
-        self.register = RegisterService(self.t32_exp)
+        self.register = RegisterService(self.t32_exp, on_write=self._memory_cache_invalidate)
         self.symbol = self.SymbolService(self)
         self.variable = self.VariableService(self)
+        if auto_packlen:
+            try:
+                self.tune(address=tune_address)
+            except BaseException:
+                # do not leave the connection open when the caller never gets the debugger
+                try:
+                    self.disconnect()
+                except ApiBaseError as e:
+                    logging.debug('closing the connection failed: {}'.format(e))
+                raise
+
+    def __attach(self, strategy=None):
+        # t32_init and t32_attach, retried as configured by the connect strategy. The library lock is only held
+        # during an attempt, so other debuggers can be used while waiting for a booting TRACE32 instance.
+        if strategy is None:
+            strategy = self.__strategy
+        start_time = time.perf_counter()
+        attempts = 0
+        while True:
+            with self.__library.lock:
+                self._set_channel()
+                self.__library.t32_init()
+                self.__library.t32_exit()
+                try:
+                    self.__library.t32_init()
+                    self.__library.t32_attach(1)  # 1 == T32_DEV_ICD
+                    return
+                except ApiReceiveFail:
+                    self.__library.t32_exit()
+            attempts += 1
+            elapsed = time.perf_counter() - start_time
+            if not strategy.retry(attempts, elapsed):
+                raise TimeoutError('connection failed after {} attempts in {:.3f} s'.format(attempts, elapsed))
+            delay = strategy.delay(attempts - 1)
+            if strategy.timeout is not None:
+                delay = min(delay, max(strategy.timeout - elapsed, 0.0))
+            logging.debug('connection attempt {} failed, retrying in {:.3f} s'.format(attempts, delay))
+            time.sleep(delay)
 
     def __enter__(self):
         return self
@@ -294,28 +500,188 @@ class Debugger:
         else:
             raise ValueError()
 
+    @_locked
     def disconnect(self):
         self._set_channel()
+        self.__release_objects()
         self.__library.t32_exit()
 
+    def reconnect(self):
+        """Re-establish the connection, e.g. after ApiReceiveFail because TRACE32 was restarted.
+
+        Node, port and packet length of the connection are kept, attempts are retried as configured by the connect
+        strategy. API objects are released, the memory cache and the known invalid memory regions are invalidated. State in TRACE32 such as breakpoints
+        is not restored, see ResilientDebugger.
+        """
+        with self.__library.lock:
+            self._set_channel()
+            self._memory_cache_invalidate()
+            # the target may have been reset, so previous delta loads and bus errors cannot be trusted
+            self.__load_manifests.clear()
+            self.__invalid_regions.clear()
+            try:
+                self.__release_objects()
+                self.__library.t32_exit()
+            except ApiBaseError as e:
+                logging.debug('closing the connection failed: {}'.format(e))
+        self.__attach()
+
+    def __release_objects(self):
+        for pool in (self.__address_pool, self.__breakpoint_pool, self.__buffer_pool):
+            pool.close()
+
     @property
     def library(self):
         return self.__library
 
-    def __cmd(self, command: str):
+    @contextlib.contextmanager
+    def locked(self, *, api_lock=False, timeout=1000):
+        """Run a sequence of calls without calls of other threads in between.
+
+        Selects the channel of this debugger and holds the lock of the library until the block is left.
+
+        Args:
+            api_lock (bool, optional): Also lock the remote API with T32_APILock, so other remote API clients of the
+                same TRACE32 instance cannot interfere. Defaults to False.
+            timeout (int, optional): Timeout for T32_APILock in milliseconds. Defaults to 1000.
+
+        Example:
+            >>> with dbg.locked():
+            ...     dbg.cmd('Data.Find D:0x0++0xffff 0x42')
+            ...     found = dbg.fnc('FOUND()')
+        """
+        with self.__library.lock:
+            self._set_channel()
+            if api_lock:
+                self.__library.t32_apilock(timeout)
+            try:
+                yield self
+            finally:
+                if api_lock:
+                    self._set_channel()
+                    self.__library.t32_apiunlock()
+
+    @property
+    def packlen(self):
+        """int: Remote API packet length of this connection."""
+        return self.__packlen
+
+    @property
+    def packlen_benchmarks(self):
+        """List[PacklenBenchmark]: Results of the last tune(), None if the packet length was not tuned."""
+        return self.__packlen_benchmarks
+
+    def __set_packlen(self, packlen, strategy=None):
+        with self.__library.lock:
+            self._set_channel()
+            self.__release_objects()
+            self.__library.t32_exit()
+            self.__library.t32_config(b"PACKLEN=", str(packlen).encode())
+        self.__attach(strategy)
+        self.__packlen = packlen
+
+    def __benchmark_packlen(self, address, length, repeat):
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            self._fnc('VERSION.BUILD()')
+        roundtrip = (time.perf_counter() - start_time) / repeat
+        if address is None:
+            return PacklenBenchmark(self.__packlen, roundtrip, None)
+        buffer = bytearray(length)
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            self.memory_read_into(address=address, buffer=buffer)
+        elapsed = time.perf_counter() - start_time
+        return PacklenBenchmark(self.__packlen, roundtrip, length * repeat / elapsed if elapsed else float('inf'))
+
+    def tune(self, *, packlens=PACKLEN_CANDIDATES, address=None, length=0x10000, repeat=10, candidate_strategy=None):
+        """Select the fastest remote API packet length.
+
+        The connection is re-established with each packet length to benchmark function round trips and, if address
+        is given, memory reads. The packet length with the highest memory throughput, or the shortest round trip
+        without address, is kept. Packet lengths the debugger rejects are skipped. The address is read once with the
+        current packet length first, so an unreadable address raises instead of rejecting every packet length.
+
+        The library lock is only held during the individual API calls, so other debuggers stay usable while
+        tuning. Do not use this debugger from other threads until tune() returns.
+
+        Args:
+            packlens (Iterable[int], optional): Packet lengths to benchmark. Defaults to PACKLEN_CANDIDATES.
+            address (Address or str, optional): Readable memory to benchmark.
+            length (int, optional): Bytes per memory read. Defaults to 64 KiB.
+            repeat (int, optional): Number of function calls and memory reads per packet length. Defaults to 10.
+            candidate_strategy (ConnectStrategy, optional): Retry policy of the connection with each candidate, so a
+                rejected packet length fails fast. Defaults to ConnectStrategy(timeout=2.0, max_attempts=3).
+
+        Returns:
+            List[PacklenBenchmark]: (packlen, roundtrip, throughput) per packet length, roundtrip in seconds and
+            throughput in bytes per second or None without address. Also available as packlen_benchmarks.
+        """
+        if address is not None:
+            address = self._address(address)
+        if candidate_strategy is None:
+            candidate_strategy = ConnectStrategy(timeout=2.0, max_attempts=3)
+        packlens = list(packlens)
+        original_packlen = self.__packlen
+        # packet length of the connection if it is attached and usable, None otherwise
+        live_packlen = self.__packlen
+        # the page cache would hide the transfers
+        memory_cache = self.__memory_cache
+        self.__memory_cache = None
+        benchmarks = []
+        try:
+            if address is not None:
+                self.memory_read_into(address=address, buffer=bytearray(length))
+            for packlen in packlens:
+                live_packlen = None
+                try:
+                    self.__set_packlen(packlen, candidate_strategy)
+                    benchmarks.append(self.__benchmark_packlen(address, length, repeat))
+                    live_packlen = packlen
+                except (ApiBaseError, TimeoutError) as e:
+                    logging.debug('packlen {} failed: {}'.format(packlen, e))
+        finally:
+            self.__memory_cache = memory_cache
+        if not benchmarks:
+            best = None
+            packlen = original_packlen
+        elif address is None:
+            best = min(benchmarks, key=lambda benchmark: benchmark.roundtrip)
+            packlen = best.packlen
+        else:
+            best = max(benchmarks, key=lambda benchmark: benchmark.throughput)
+            packlen = best.packlen
+        if live_packlen != packlen:
+            self.__set_packlen(packlen)
+        if best is None:
+            raise ValueError('no usable packet length in {}, reconnected with {}'.format(packlens, packlen))
+        self.__packlen_benchmarks = benchmarks
+        return benchmarks
+
+    def _address(self, address):
+        if isinstance(address, str):
+            return Address.from_string(self, address)
+        return address
+
+    def __cmd(self, command: str, *, invalidate=True):
         """Only for internal use! Use 'cmd' without leading underscores instead!"""
         logging.debug(command)
+        if invalidate:
+            # any command may change memory or start the target
+            self._memory_cache_invalidate(may_run=True)
         result = (ctypes.c_char * 4096)()
         try:
             self.__library.t32_executecommand(command.encode(), result, 4096)
         except ExecuteCommandError as e:
             raise ExecuteCommandError(result.value.decode()).with_traceback(e.__traceback__) from None
 
+    @_locked
     def _cmd(self, command: str):
         """Only for internal use! Use 'cmd' without leading underscores instead!"""
         self._set_channel()
         self.__cmd(command)
 
+    @_locked
     def _fnc(self, command: str):
         """Only for internal use! Use 'fnc' without leading underscores instead!"""
         self._set_channel()
@@ -387,12 +753,14 @@ class Debugger:
             self.__event_service = self.EventService(self)
         return self.__event_service
 
+    @_locked
     def event_init(self):
         self._set_channel()
         # self.__library.t32_notifyeventenable(b'SYSUP', callback_function_type(callback_function))
         self.__callback = c_callback_function
         self.__library.t32_notifystateenable(0x00, c_callback_function)
 
+    @_locked
     def event_init_poll(self):
         self._set_channel()
         # self.__library.t32_notifyeventenable(b'SYSUP', callback_function_type(callback_function))
@@ -400,6 +768,7 @@ class Debugger:
         self.__library.t32_notifystateenable(0x00, c_callback_function)
         self.EventPollThread(self).start()
 
+    @_locked
     def event_poll(self):
         self._set_channel()
         self.__library.t32_checkstatenotify(0)
@@ -407,6 +776,7 @@ class Debugger:
     def print(self, string):
         self.cmd('ECHO "{}"'.format(string))
 
+    @_locked
     def t32_ping(self):
         self._set_channel()
         self.__library.t32_ping()
@@ -418,9 +788,12 @@ class Debugger:
         def __call__(self, command: str):
             self.__parent._cmd(command)
 
-    def cmm(self, cmd: str, *, error_check: bool = False, timeout: float = 0):
+    def cmm(self, cmd: str, *, error_check: bool = False, timeout: float = 0, poll_interval: float = 0.01):
         """Executes PRACTICE *.cmm script, blocking.
 
+        The library lock is only held during the individual API calls, so other threads and debuggers are not
+        blocked while the script runs.
+
         Args:
             cmd (str): Script path and name.
             error_check (bool): Set to check for occurred errors.
@@ -428,6 +801,7 @@ class Debugger:
                 Special values:
                 - None: Don't poll for script to finish (non-blocking)
                 - 0: Wait indefinitely.
+            poll_interval (float, optional, default=0.01): Seconds between polls of the PRACTICE state.
 
         Raises:
             TimeoutError: If script execution took longer than timeout.
@@ -436,32 +810,33 @@ class Debugger:
             recursive check of caller until script name is different
             returned values PRACTICE.ARGS()
         """
-        self._set_channel()
         if error_check:
-            self.__cmd('ERROR.RESet')
+            self._cmd('ERROR.RESet')
         if timeout is not None:
             caller_file_pre = self.fnc('PRACTICE.CALLER.FILE(0.)')
             caller_line_pre = self._fnc('PRACTICE.CALLER.LINE(0.)')
         start_time = time.perf_counter()
-        self.__cmd('DO {}'.format(cmd))
-        practice_state = ctypes.c_int()
-        if timeout is not None:
+        self._cmd('DO {}'.format(cmd))
+        if timeout is None:
+            self.__memory_cache_check_practice = True
+        else:
             while True:
-                self.__library.t32_getpracticestate(practice_state)
-                if practice_state.value == 0:
+                practice_state = self._get_practice_state()
+                if practice_state == 0:
                     # not running
                     break
-                elif practice_state.value == 1:
+                elif practice_state == 1:
                     # running
                     pass
-                elif practice_state.value == 2:
+                elif practice_state == 2:
                     # dialog window open
                     pass
                 else:
-                    raise ValueError('Unknown / Invalid practice state: {}'.format(practice_state.value))
+                    raise ValueError('Unknown / Invalid practice state: {}'.format(practice_state))
                 if timeout != 0:
                     if time.perf_counter() - start_time > timeout:
                         raise TimeoutError()
+                time.sleep(poll_interval)
             if error_check:
                 print(self.cmd_eval(b'EVAL ERROR.OCCURRED()'))
             caller_file_post = self.cmd_str('PRACTICE.CALLER.FILE(0.)')
@@ -469,6 +844,7 @@ class Debugger:
             # print(caller_file_post)
             # print(caller_line_post)
 
+    @_locked
     def cmd_bool(self, cmd: str) -> int:
         result = ctypes.c_uint32()
         self._set_channel()
@@ -481,6 +857,7 @@ class Debugger:
         else:
             raise ValueError(result.value)
 
+    @_locked
     def cmd_int(self, cmd: str) -> int:
         result = (ctypes.c_char * 4096)()
         self._set_channel()
@@ -488,6 +865,7 @@ class Debugger:
         self.__library.t32_evalgetstring(result)
         return int(result.value)
 
+    @_locked
     def cmd_float(self, cmd: str) -> float:
         result = (ctypes.c_char * 4096)()
         self._set_channel()
@@ -495,6 +873,7 @@ class Debugger:
         self.__library.t32_evalgetstring(result)
         return float(result.value)
 
+    @_locked
     def cmd_decimal(self, cmd: str) -> decimal.Decimal():
         result = (ctypes.c_char * 4096)()
         self._set_channel()
@@ -502,6 +881,7 @@ class Debugger:
         self.__library.t32_evalgetstring(result)
         return decimal.Decimal(result.value.decode())
 
+    @_locked
     def cmd_str(self, cmd: str) -> str:
         result = (ctypes.c_char * 4096)()
         self._set_channel()
@@ -516,28 +896,33 @@ class Debugger:
         def __call__(self, command: str):
             return self.__parent._fnc(command)
 
+    @_locked
     def t32_stop(self):
         self._set_channel()
         self.__library.t32_stop()
 
+    @_locked
     def t32_eval_get(self):
         evaluation_result = ctypes.c_uint32()
         self._set_channel()
         self.__library.t32_evalget(evaluation_result)
         return evaluation_result.value
 
+    @_locked
     def t32_eval_get_string(self):
         evaluation_string = (ctypes.c_char * 4096)()
         self._set_channel()
         self.__library.t32_evalgetstring(evaluation_string)
         return evaluation_string.value
 
+    @_locked
     def _get_practice_state(self):
         self._set_channel()
         practice_state = ctypes.c_int()
         self.__library.t32_getpracticestate(practice_state)
         return practice_state.value
 
+    @_locked
     def get_window_content(self, *, command: str, requested: int, offset: int, print_code: str) -> bytes:
         PRINT_CODES = {'ASCII': 0x41, 'ASCIIP': 0x42, 'ASCIIE': 0x43, 'CSV': 0x44, 'XML': 0x45}
         try:
@@ -554,6 +939,7 @@ class Debugger:
         print(len(bytes(buffer.value)))
         return buffer.value.decode()
 
+    @_locked
     def get_message(self):
         # execute
         message_text = (ctypes.c_char * 256)()
@@ -562,43 +948,64 @@ class Debugger:
         self.__library.t32_getmessage(message_text, message_type)
         return collections.namedtuple('message', ['text', 'type'])(message_text.value.decode(), message_type.value)
 
+    @_locked
     def step(self):
         self._set_channel()
+        self._memory_cache_invalidate(may_run=True)
         # self.__cmd('Step')
         self.__library.t32_step()
 
+    @_locked
     def step_asm(self):
         self._set_channel()
+        self._memory_cache_invalidate(may_run=True)
         # self.__cmd('Step.Asm')
         self.__library.t32_stepmode(0)
 
+    @_locked
     def step_hll(self):
         self._set_channel()
+        self._memory_cache_invalidate(may_run=True)
         # self.__cmd('Step.Hll')
         self.__library.t32_stepmode(1)
 
+    @_locked
     def step_over(self):
         self._set_channel()
         self.__cmd('Step.Over')
 
+    @_locked
     def go(self):
         self._set_channel()
+        self._memory_cache_invalidate(may_run=True)
         # self.__cmd('Go')
         self.__library.t32_go()
 
+    @_locked
     def go_up(self):
         self._set_channel()
         self.__cmd('Go.Up')
 
+    @_locked
     def go_return(self):
         self._set_channel()
         self.__cmd('Go.Return')
 
+    @_locked
     def break_(self):
         self._set_channel()
+        self._memory_cache_invalidate()
         # self.__cmd('Break')
         self.__library.t32_break()
 
+    @_locked
+    def _memory_cache_invalidate(self, *, may_run=False):
+        if self.__memory_cache is not None:
+            self.__memory_cache.invalidate()
+            if may_run:
+                self.__memory_cache_check_state = True
+
+    @_locked
     def get_state(self):
         self._set_channel()
         c_state = ctypes.c_int()
@@ -612,6 +1019,364 @@ class Debugger:
         def read(self, *args, **kwargs):
             return self.__parent.memory_read(*args, **kwargs)
 
+        def enable_cache(self, *, page_size=4096, max_pages=1024):
+            """Enable the memory page cache.
+
+            Reads through read(), read_into() and the typed accessors are served from cached pages while the target
+            is stopped. Missing pages are fetched with one bundled transfer. The cache is invalidated by go(),
+            step*(), break_(), cmd(), cmm() and register writes; memory writes invalidate the written pages. After
+            the target may have been started, the target state is checked once before the cache is used again,
+            reads while the target is running bypass the cache.
+
+            Args:
+                page_size (int, optional): Page size in bytes. Defaults to 4096.
+                max_pages (int, optional): Maximum number of cached pages. The least recently used page is evicted
+                    first. Defaults to 1024.
+            """
+            self.__parent.memory_cache_enable(page_size=page_size, max_pages=max_pages)
+
+        def disable_cache(self):
+            """Disable the memory page cache and drop all cached pages."""
+            self.__parent.memory_cache_disable()
+
+        def invalidate_cache(self):
+            """Drop all cached pages."""
+            self.__parent._memory_cache_invalidate()
+
+        def cache_info(self):
+            """Memory page cache statistics.
+
+            Returns:
+                MemoryCacheInfo: (hits, misses, pages, max_pages, page_size) or None if the cache is disabled.
+            """
+            return self.__parent.memory_cache_info()
+
+        def read_many(self, entries):
+            """Read several memory regions with as few transfers as possible.
+
+            The regions are packed into memory bundles that fit into one packet each. Regions larger than a packet
+            are split and reassembled.
+
+            Args:
+                entries (List[Tuple[Address, int]]): Address and length in bytes of each region.
+
+            Returns:
+                List[MemoryReadResult]: One (data, status) tuple per region. status is 0 on success, otherwise the
+                error code reported for the region, in which case data is None.
+            """
+            return self.__parent.memory_read_many(entries)
+
+        def read_into(self, address, buffer):
+            """Read memory from address into a writable buffer.
+
+            The number of bytes read is the size of the buffer in bytes. The data is copied once from the API's
+            buffer object into the buffer, no intermediate objects are created.
+
+            Args:
+                address (Address): Address to read from.
+                buffer: Writable, contiguous object supporting the buffer protocol, e.g. bytearray, memoryview or
+                    numpy.ndarray.
+
+            Returns:
+                int: Number of bytes read.
+            """
+            return self.__parent.memory_read_into(address=address, buffer=buffer)
+
+        def read_array(self, address, dtype, count, *, byteorder=None):
+            """Read an array of values from address and return result.
+
+            The values are read with one transfer directly into the result and converted to the host byte order
+            in place.
+
+            Args:
+                address (Address): Address to read from.
+                dtype (str or numpy.dtype): One of 'int8', 'uint8', 'int16', 'uint16', 'int32', 'uint32', 'int64',
+                    'uint64', 'float' or 'double' to return an array.array. Any other value is passed to numpy.dtype()
+                    and a numpy.ndarray is returned, e.g. numpy.uint16 or '>u2' (requires NumPy).
+                count (int): Number of values to read.
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host. For NumPy
+                    arrays it overrides the byte order of dtype, otherwise the byte order of dtype is used.
+
+            Returns:
+                array.array or numpy.ndarray: Result
+            """
+            typecode = ARRAY_TYPECODES.get(dtype) if isinstance(dtype, str) else None
+            if typecode is None:
+                import numpy
+                dtype = numpy.dtype(dtype)
+                if byteorder is not None:
+                    dtype = dtype.newbyteorder({'little': '<', 'big': '>'}[byteorder])
+                values = numpy.empty(count, dtype=dtype)
+                self.read_into(address, values)
+                return values
+            values = array.array(typecode, [0]) * count
+            self.read_into(address, values)
+            if byteorder is not None and byteorder != sys.byteorder:
+                values.byteswap()
+            return values
+
+        def write_array(self, address, values, dtype=None, *, byteorder=None):
+            """Write an array of values to address.
+
+            Args:
+                address (Address): Address to write to.
+                values (Iterable): Values to write. array.array and numpy.ndarray objects are written without
+                    conversion unless dtype or byteorder require it.
+                dtype (str, optional): One of 'int8', 'uint8', 'int16', 'uint16', 'int32', 'uint32', 'int64', 'uint64',
+                    'float' or 'double'. Required unless values is an array.array or numpy.ndarray.
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host. Not supported
+                    for numpy.ndarray objects, whose dtype already defines the byte order.
+
+            Values that already have the requested type are written through the buffer protocol. Other values are
+            converted in one vectorized step with NumPy if it is installed.
+            """
+            swap = byteorder is not None and byteorder != sys.byteorder
+            if dtype is None:
+                if swap:
+                    if not isinstance(values, array.array):
+                        raise ValueError('byteorder requires dtype or an array.array')
+                    values = array.array(values.typecode, values)
+                    values.byteswap()
+                self.write(address=address, buffer=values)
+                return
+            typecode = ARRAY_TYPECODES[dtype]
+            if isinstance(values, (bytes, bytearray, memoryview)):
+                # bytes-like values hold one value per byte
+                values = memoryview(values).cast('B')
+            if isinstance(values, array.array) and values.typecode == typecode:
+                if swap:
+                    values = array.array(typecode, values)
+                    values.byteswap()
+                self.write(address=address, buffer=values)
+                return
+            try:
+                import numpy
+            except ImportError:
+                values = array.array(typecode, values)
+                if swap:
+                    values.byteswap()
+                self.write(address=address, buffer=values)
+                return
+            # the byte order is part of the NumPy dtype, no copy if values already match
+            prefix = {None: '=', 'little': '<', 'big': '>'}[byteorder]
+            values = numpy.ascontiguousarray(values, dtype=numpy.dtype(prefix + typecode))
+            self.write(address=address, buffer=values)
+
+        def sampler(self, entries, *, rate, capacity=4096):
+            """Create a Sampler that reads the regions periodically on a background thread.
+
+            Args:
+                entries (List[Tuple[Address, int]]): Address and length in bytes of each region.
+                rate (float): Target sample rate in Hz.
+                capacity (int, optional): Number of records in the ring buffer. Defaults to 4096.
+
+            Returns:
+                Sampler: The sampler, not started yet.
+            """
+            return Sampler(self.__parent, entries, rate=rate, capacity=capacity)
+
+        def read_struct(self, address, layout, count=None, *, columns=False, numpy=False):
+            """Read records described by a layout with one transfer and decode them.
+
+            Args:
+                address (Address): Address of the first record.
+                layout (Layout): Layout of a record. Layouts are compiled once and should be reused.
+                count (int, optional): Number of consecutive records. If None, a single record is returned.
+                columns (bool, optional): Return a dict of field name to list of values instead of records.
+                numpy (bool, optional): Return a structured numpy.ndarray (requires NumPy).
+
+            Returns:
+                Record, List[Record], Dict[str, list] or numpy.ndarray: Result
+            """
+            data = self.read(address=address, length=layout.size * (1 if count is None else count))
+            if numpy:
+                return layout.decode_numpy(data, 1 if count is None else count)
+            return layout.decode(data, count, columns=columns)
+
+        def dump(self, address, length, file, *, chunk_size=None, callback=None):
+            """Dump memory to a file.
+
+            The region is read in chunks while the previous chunk is written to the file by a background thread.
+            Memory use is bounded by a few chunks, independent of length.
+
+            Args:
+                address (Address): Start address.
+                length (int): Number of bytes to dump.
+                file (str or file object): Path of the output file or a binary file object opened for writing.
+                chunk_size (int, optional): Bytes per read, rounded down to a multiple of the packet length.
+                    Defaults to 64 packets.
+                callback (Callable[[TransferProgress], None], optional): Called after each chunk with the progress.
+
+            Returns:
+                TransferProgress: Bytes transferred, total, elapsed seconds and throughput in bytes per second.
+            """
+            return self.__parent.memory_dump(address=address, length=length, file=file, chunk_size=chunk_size,
+                                             callback=callback)
+
+        def load(self, address, file, *, callback=None):
+            """Load a binary image into memory.
+
+            The image is streamed to the target with pipelined writes (T32_WriteMemoryPipe) which do not wait for an
+            acknowledgement of each packet. Errors are checked once after the last packet.
+
+            Args:
+                address (Address): Start address. Only 32-bit addresses are supported.
+                file (str, file object or buffer): Path of the image, a binary file object opened for reading or an
+                    object supporting the buffer protocol, e.g. bytes or mmap.mmap.
+                callback (Callable[[TransferProgress], None], optional): Called after each packet with the progress.
+                    total is None if the size of a file object is unknown.
+
+            Returns:
+                TransferProgress: Bytes transferred, total, elapsed seconds and throughput in bytes per second.
+            """
+            return self.__parent.memory_load(address=address, file=file, callback=callback)
+
+        def read_tolerant(self, address, length, *, granularity=256, block_size=0x1000):
+            """Read a partially mapped memory region without raising on bus errors.
+
+            The region is read in blocks with bundled transfers. Blocks that fail are bisected until the failing
+            granules are found. Failing granules are remembered and skipped by later reads until
+            clear_invalid_regions() is called.
+
+            Args:
+                address (Address): Start address.
+                length (int): Length of the region in bytes.
+                granularity (int, optional): Smallest unit in bytes that is marked invalid. Granules are aligned to
+                    multiples of granularity. Defaults to 256.
+                block_size (int, optional): Size of the initial blocks in bytes, a multiple of granularity.
+                    Defaults to 4 KiB.
+
+            Returns:
+                TolerantReadResult: (data, valid). Invalid bytes in data are 0. valid contains one byte per granule
+                starting with the granule that contains address, 1 if the granule was read and 0 otherwise.
+            """
+            return self.__parent.memory_read_tolerant(address=address, length=length, granularity=granularity,
+                                                      block_size=block_size)
+
+        def clear_invalid_regions(self):
+            """Forget the invalid regions learned by read_tolerant()."""
+            self.__parent.memory_clear_invalid_regions()
+
+        def find(self, pattern, start, end, mask=None, max_hits=None):
+            """Search memory for a byte pattern.
+
+            The search runs in TRACE32 (Data.Find), only the hit addresses are transferred. If the debugger cannot
+            search the range, memory is read in chunks and scanned locally.
+
+            Args:
+                pattern (bytes or str): Pattern to search for.
+                start (Address): First address of the range.
+                end (int or Address): Address after the last address of the range.
+                mask (bytes, optional): Bit mask per pattern byte, bits that are 0 are ignored.
+                max_hits (int, optional): Stop after this number of hits.
+
+            Returns:
+                List[Address]: Addresses of the hits in ascending order.
+            """
+            return self.__parent.memory_find(pattern=pattern, start=start, end=end, mask=mask, max_hits=max_hits)
+
+        def fill(self, address, length, pattern):
+            """Fill a memory region with a repeated byte pattern (Data.Set).
+
+            Args:
+                address (Address): Start address.
+                length (int): Length of the region in bytes, must be positive.
+                pattern (bytes or int): Pattern, an int is a single byte.
+            """
+            self.__parent.memory_fill(address=address, length=length, pattern=pattern)
+
+        def copy(self, address, length, destination):
+            """Copy a memory region inside the debugger (Data.COPY).
+
+            Args:
+                address (Address): Start address of the source region.
+                length (int): Length of the region in bytes, must be positive.
+                destination (Address): Start address of the destination.
+            """
+            self.__parent.memory_copy(address=address, length=length, destination=destination)
+
+        def test(self, address, length, pattern=None):
+            """Run a destructive memory test on a region (Data.Test).
+
+            Args:
+                address (Address): Start address.
+                length (int): Length of the region in bytes, must be positive.
+                pattern (str, optional): 'prime', 'random' or 'toggle'. Defaults to the standard test of Data.Test.
+
+            Returns:
+                MemoryTestResult: (passed, address) with the address of the first error or None.
+            """
+            return self.__parent.memory_test(address=address, length=length, pattern=pattern)
+
+        def load_delta(self, address, file, *, block_size=0x10000, manifest=None):
+            """Load a binary image, writing only the blocks that differ from memory.
+
+            A manifest of the CRC32 checksums of the last loaded image is kept per address. If the debugger's
+            checksum of the whole region (Data.SUM /CRC32) shows that memory still contains that image, only blocks
+            whose checksum changed in the new image are written. Otherwise the debugger's checksum of each block is
+            compared with the new image. Changed blocks are written with bundled writes.
+
+            Args:
+                address (Address): Start address.
+                file (str, file object or buffer): Path of the image, a binary file object opened for reading or an
+                    object supporting the buffer protocol.
+                block_size (int, optional): Size of the compared blocks in bytes. Defaults to 64 KiB.
+                manifest (str, optional): Path of a JSON file to store the manifest in, so it persists across
+                    sessions.
+
+            Returns:
+                DeltaLoadResult: (blocks, written_blocks, written_bytes)
+            """
+            return self.__parent.memory_load_delta(address=address, file=file, block_size=block_size,
+                                                   manifest=manifest)
+
+        def verify(self, address, file, *, block_size=0x10000):
+            """Compare memory with a local image.
+
+            The CRC32 checksum of each block is computed by the debugger (Data.SUM /CRC32) and compared with the
+            checksum of the image, only blocks with different checksums are read back and compared.
+
+            Args:
+                address (Address): Start address of the image in memory.
+                file (str, file object or buffer): Path of the image, a binary file object opened for reading or an
+                    object supporting the buffer protocol.
+                block_size (int, optional): Size of the checksum blocks in bytes. Defaults to 64 KiB.
+
+            Returns:
+                List[MemoryMismatch]: (address, expected, actual) per differing range, empty if memory matches.
+            """
+            return self.__parent.memory_verify(address=address, file=file, block_size=block_size)
+
+        def snapshot(self, address, length, *, block_size=0x10000):
+            """Read a memory region together with a CRC32 checksum of each block.
+
+            Args:
+                address (Address): Start address.
+                length (int): Length of the region in bytes.
+                block_size (int, optional): Size of the checksum blocks in bytes. Smaller blocks make diff() transfer
+                    less data per change but need more checksum requests. Defaults to 64 KiB.
+
+            Returns:
+                MemorySnapshot: Snapshot to pass to diff().
+            """
+            return self.__parent.memory_snapshot(address=address, length=length, block_size=block_size)
+
+        def diff(self, snapshot, *, update=True):
+            """Return the changes of a memory region since the snapshot was taken.
+
+            The debugger computes the checksum of each block, only blocks whose checksum differs from the snapshot
+            are transferred and compared.
+
+            Args:
+                snapshot (MemorySnapshot): Snapshot returned by snapshot().
+                update (bool, optional): Update the snapshot to the current memory content, so the next diff()
+                    returns the changes since this call. Defaults to True.
+
+            Returns:
+                List[MemoryChange]: (address, old, new) per changed range, ordered by address.
+            """
+            return self.__parent.memory_diff(snapshot=snapshot, update=update)
+
         def read_int8(self, address, *, width=1):
             """Read signed 8-bit value from address and return result.
 
@@ -623,7 +1388,7 @@ class Debugger:
                 int: Result
             """
             buffer = self.read(address=address, length=1, width=width)
-            return struct.unpack('b', buffer)[0]
+            return SCALAR_STRUCTS['int8'].unpack(buffer)[0]
 
         def read_int8_array(self, address, *, length, width=1):
             """Read signed 8-bit array from address and return result.
@@ -634,10 +1399,9 @@ class Debugger:
                 width (int, optional): Reserved.
 
             Returns:
-                Tuple[int]: Result
+                array.array: Result
             """
-            buffer = self.read(address=address, length=length, width=width)
-            return struct.unpack('{}b'.format(length), buffer)
+            return self.read_array(address, 'int8', length)
 
         def read_uint8(self, address: Address, *, width=1):
             """Read unsigned 8-bit value from address and return result.
@@ -650,7 +1414,7 @@ class Debugger:
                 int: Result
             """
             buffer = self.read(address=address, length=1, width=width)
-            return struct.unpack('B', buffer)[0]
+            return SCALAR_STRUCTS['uint8'].unpack(buffer)[0]
 
         def read_uint8_array(self, address, *, length=1, width=1):
             """Read unsigned 8-bit values from address and return result.
@@ -661,10 +1425,9 @@ class Debugger:
                 width (int, optional): Reserved.
 
             Returns:
-                Tuple[int]: Result
+                array.array: Result
             """
-            buffer = self.read(address=address, length=length, width=width)
-            struct.unpack('{}B'.format(length), buffer)
+            return self.read_array(address, 'uint8', length)
 
         def read_int16(self, address, *, width=2):
             """Read unsigned 8-bit value from address and return result.
@@ -677,7 +1440,21 @@ class Debugger:
                 Tuple[int]: Result
             """
             buffer = self.read(address=address, length=2, width=width)
-            return struct.unpack('h', buffer)[0]
+            return SCALAR_STRUCTS['int16'].unpack(buffer)[0]
+
+        def read_int16_array(self, address, *, length, byteorder=None, width=2):
+            """Read signed 16-bit values from address and return result.
+
+            Args:
+                address (Address): Address to read from
+                length (int): Number of values to read
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+
+            Returns:
+                array.array: Result
+            """
+            return self.read_array(address, 'int16', length, byteorder=byteorder)
 
         def read_uint16(self, address, *, width=2):
             """Read unsigned 8-bit values from address and return result.
@@ -690,7 +1467,21 @@ class Debugger:
                 Tuple[int]: Result
             """
             buffer = self.read(address=address, length=2, width=width)
-            return struct.unpack('H', buffer)[0]
+            return SCALAR_STRUCTS['uint16'].unpack(buffer)[0]
+
+        def read_uint16_array(self, address, *, length, byteorder=None, width=2):
+            """Read unsigned 16-bit values from address and return result.
+
+            Args:
+                address (Address): Address to read from
+                length (int): Number of values to read
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+
+            Returns:
+                array.array: Result
+            """
+            return self.read_array(address, 'uint16', length, byteorder=byteorder)
 
         def read_int32(self, address, *, width=4):
             """Read unsigned 8-bit values from address and return result.
@@ -703,7 +1494,21 @@ class Debugger:
                 Tuple[int]: Result
             """
             buffer = self.read(address=address, length=4, width=width)
-            return struct.unpack('i', buffer)[0]
+            return SCALAR_STRUCTS['int32'].unpack(buffer)[0]
+
+        def read_int32_array(self, address, *, length, byteorder=None, width=4):
+            """Read signed 32-bit values from address and return result.
+
+            Args:
+                address (Address): Address to read from
+                length (int): Number of values to read
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+
+            Returns:
+                array.array: Result
+            """
+            return self.read_array(address, 'int32', length, byteorder=byteorder)
 
         def read_uint32(self, address, *, width=4):
             """Read unsigned 8-bit values from address and return result.
@@ -716,7 +1521,21 @@ class Debugger:
                 Tuple[int]: Result
             """
             buffer = self.read(address=address, length=4, width=width)
-            return struct.unpack('I', buffer)[0]
+            return SCALAR_STRUCTS['uint32'].unpack(buffer)[0]
+
+        def read_uint32_array(self, address, *, length, byteorder=None, width=4):
+            """Read unsigned 32-bit values from address and return result.
+
+            Args:
+                address (Address): Address to read from
+                length (int): Number of values to read
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+
+            Returns:
+                array.array: Result
+            """
+            return self.read_array(address, 'uint32', length, byteorder=byteorder)
 
         def read_int64(self, address, *, width=8):
             """Read unsigned 8-bit values from address and return result.
@@ -729,7 +1548,21 @@ class Debugger:
                 Tuple[int]: Result
             """
             buffer = self.read(address=address, length=8, width=width)
-            return struct.unpack('q', buffer)[0]
+            return SCALAR_STRUCTS['int64'].unpack(buffer)[0]
+
+        def read_int64_array(self, address, *, length, byteorder=None, width=8):
+            """Read signed 64-bit values from address and return result.
+
+            Args:
+                address (Address): Address to read from
+                length (int): Number of values to read
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+
+            Returns:
+                array.array: Result
+            """
+            return self.read_array(address, 'int64', length, byteorder=byteorder)
 
         def read_uint64(self, address, *, width=8):
             """Read unsigned 8-bit values from address and return result.
@@ -742,19 +1575,86 @@ class Debugger:
                 Tuple[int]: Result
             """
             buffer = self.read(address=address, length=8, width=width)
-            return struct.unpack('Q', buffer)[0]
+            return SCALAR_STRUCTS['uint64'].unpack(buffer)[0]
+
+        def read_uint64_array(self, address, *, length, byteorder=None, width=8):
+            """Read unsigned 64-bit values from address and return result.
+
+            Args:
+                address (Address): Address to read from
+                length (int): Number of values to read
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+
+            Returns:
+                array.array: Result
+            """
+            return self.read_array(address, 'uint64', length, byteorder=byteorder)
 
         def read_float(self, address, *, width=4):
             buffer = self.read(address=address, length=4, width=width)
-            return struct.unpack('f', buffer)[0]
+            return SCALAR_STRUCTS['float'].unpack(buffer)[0]
+
+        def read_float_array(self, address, *, length, byteorder=None, width=4):
+            """Read single precision floating point values from address and return result.
+
+            Args:
+                address (Address): Address to read from
+                length (int): Number of values to read
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+
+            Returns:
+                array.array: Result
+            """
+            return self.read_array(address, 'float', length, byteorder=byteorder)
 
         def read_double(self, address, *, width=8):
             buffer = self.read(address=address, length=8, width=width)
-            return struct.unpack('d', buffer)[0]
+            return SCALAR_STRUCTS['double'].unpack(buffer)[0]
+
+        def read_double_array(self, address, *, length, byteorder=None, width=8):
+            """Read double precision floating point values from address and return result.
+
+            Args:
+                address (Address): Address to read from
+                length (int): Number of values to read
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+
+            Returns:
+                array.array: Result
+            """
+            return self.read_array(address, 'double', length, byteorder=byteorder)
 
         def write(self, *args, **kwargs):
+            """Write buffer to address.
+
+            Args:
+                address (Address): Address to write to.
+                buffer: Data to write. Any contiguous object supporting the buffer protocol, e.g. bytes, bytearray,
+                    memoryview, mmap.mmap or numpy.ndarray.
+                length (int, optional): Number of bytes to write. Defaults to the size of buffer in bytes.
+                width (int, optional): Reserved.
+
+            Large buffers are transferred in chunks of the packet length configured in connect().
+            """
             return self.__parent.memory_write(*args, **kwargs)
 
+        def write_many(self, entries):
+            """Write several memory regions with as few transfers as possible.
+
+            The regions are packed into memory bundles that fit into one packet each. Regions larger than a packet
+            are split.
+
+            Args:
+                entries (List[Tuple[Address, bytes]]): Address and data of each region.
+
+            Returns:
+                List[int]: Status of each region. 0 on success, otherwise the error code reported for the region.
+            """
+            return self.__parent.memory_write_many(entries)
+
         def write_int8(self, address, value, *, width=1):
             """Write signed 8-bit value to address.
 
@@ -763,7 +1663,7 @@ class Debugger:
                 value (int): Value to write.
                 width (int, optional): Reserved.
             """
-            buffer = struct.pack('b', value)
+            buffer = SCALAR_STRUCTS['int8'].pack(value)
             self.write(address=address, buffer=buffer, length=1, width=width)
 
         def write_int8_array(self, address, data, *, width=1):
@@ -774,9 +1674,7 @@ class Debugger:
                 data (Tuple[int]): Data to write.
                 width (int, optional): Reserved.
             """
-            data_len = len(data)
-            buffer = struct.pack('{}b'.format(data_len), *data)
-            self.write(address=address, buffer=buffer, length=data_len, width=width)
+            self.write_array(address, data, 'int8')
 
         def write_uint8(self, address, value, *, width=1):
             """Write unsigned 8-bit value to address.
@@ -786,7 +1684,7 @@ class Debugger:
                 value (int): Value to write.
                 width (int, optional): Reserved.
             """
-            buffer = struct.pack('B', value)
+            buffer = SCALAR_STRUCTS['uint8'].pack(value)
             self.write(address=address, buffer=buffer, length=1, width=width)
 
         def write_uint8_array(self, address, data, *, width=1):
@@ -797,9 +1695,7 @@ class Debugger:
                 data (Tuple[int]): Data to write.
                 width (int, optional): Reserved.
             """
-            data_len = len(data)
-            buffer = struct.pack('{}B'.format(data_len), *data)
-            self.write(address=address, buffer=buffer, length=data_len, width=width)
+            self.write_array(address, data, 'uint8')
 
         def write_int16(self, address, value, *, width=2):
             """Write signed 16-bit value to address.
@@ -809,9 +1705,20 @@ class Debugger:
                 value (int): Value to write.
                 width (int, optional): Reserved.
             """
-            buffer = struct.pack('h', value)
+            buffer = SCALAR_STRUCTS['int16'].pack(value)
             self.write(address=address, buffer=buffer, length=2, width=width)
 
+        def write_int16_array(self, address, data, *, byteorder=None, width=2):
+            """Write data as signed 16-bit values to address.
+
+            Args:
+                address (Address): Address to write to.
+                data (Iterable[int]): Data to write, e.g. a list, array.array or numpy.ndarray.
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+            """
+            self.write_array(address, data, 'int16', byteorder=byteorder)
+
         def write_uint16(self, address, value, *, width=2):
             """Write unsigned 16-bit value to address.
 
@@ -820,9 +1727,20 @@ class Debugger:
                 value (int): Value to write.
                 width (int, optional): Reserved.
             """
-            buffer = struct.pack('H', value)
+            buffer = SCALAR_STRUCTS['uint16'].pack(value)
             self.write(address=address, buffer=buffer, length=2, width=width)
 
+        def write_uint16_array(self, address, data, *, byteorder=None, width=2):
+            """Write data as unsigned 16-bit values to address.
+
+            Args:
+                address (Address): Address to write to.
+                data (Iterable[int]): Data to write, e.g. a list, array.array or numpy.ndarray.
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+            """
+            self.write_array(address, data, 'uint16', byteorder=byteorder)
+
         def write_int32(self, address, value, *, width=4):
             """Write signed 32-bit value to address.
 
@@ -831,9 +1749,20 @@ class Debugger:
                 value (int): Value to write.
                 width (int, optional): Reserved.
             """
-            buffer = struct.pack('i', value)
+            buffer = SCALAR_STRUCTS['int32'].pack(value)
             self.write(address=address, buffer=buffer, length=4, width=width)
 
+        def write_int32_array(self, address, data, *, byteorder=None, width=4):
+            """Write data as signed 32-bit values to address.
+
+            Args:
+                address (Address): Address to write to.
+                data (Iterable[int]): Data to write, e.g. a list, array.array or numpy.ndarray.
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+            """
+            self.write_array(address, data, 'int32', byteorder=byteorder)
+
         def write_uint32(self, address, value, *, width=4):
             """Write unsigned 32-bit value to address.
 
@@ -842,9 +1771,20 @@ class Debugger:
                 value (int): Value to write.
                 width (int, optional): Reserved.
             """
-            buffer = struct.pack('I', value)
+            buffer = SCALAR_STRUCTS['uint32'].pack(value)
             self.write(address=address, buffer=buffer, length=4, width=width)
 
+        def write_uint32_array(self, address, data, *, byteorder=None, width=4):
+            """Write data as unsigned 32-bit values to address.
+
+            Args:
+                address (Address): Address to write to.
+                data (Iterable[int]): Data to write, e.g. a list, array.array or numpy.ndarray.
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+            """
+            self.write_array(address, data, 'uint32', byteorder=byteorder)
+
         def write_int64(self, address, value, *, width=8):
             """Write signed 64-bit value to address.
 
@@ -853,9 +1793,20 @@ class Debugger:
                 value (int): Value to write.
                 width (int, optional): Reserved.
             """
-            buffer = struct.pack('q', value)
+            buffer = SCALAR_STRUCTS['int64'].pack(value)
             self.write(address=address, buffer=buffer, length=8, width=width)
 
+        def write_int64_array(self, address, data, *, byteorder=None, width=8):
+            """Write data as signed 64-bit values to address.
+
+            Args:
+                address (Address): Address to write to.
+                data (Iterable[int]): Data to write, e.g. a list, array.array or numpy.ndarray.
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+            """
+            self.write_array(address, data, 'int64', byteorder=byteorder)
+
         def write_uint64(self, address, value, *, width=8):
             """Write unsigned 64-bit value to address.
 
@@ -864,48 +1815,562 @@ class Debugger:
                 value (int): Value to write.
                 width (int, optional): Reserved.
             """
-            buffer = struct.pack('Q', value)
+            buffer = SCALAR_STRUCTS['uint64'].pack(value)
             self.write(address=address, buffer=buffer, length=8, width=width)
 
+        def write_uint64_array(self, address, data, *, byteorder=None, width=8):
+            """Write data as unsigned 64-bit values to address.
+
+            Args:
+                address (Address): Address to write to.
+                data (Iterable[int]): Data to write, e.g. a list, array.array or numpy.ndarray.
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+            """
+            self.write_array(address, data, 'uint64', byteorder=byteorder)
+
         def write_float(self, address, value, *, width=4):
-            buffer = struct.pack('f', value)
+            buffer = SCALAR_STRUCTS['float'].pack(value)
             self.write(address=address, buffer=buffer, length=4, width=width)
 
+        def write_float_array(self, address, data, *, byteorder=None, width=4):
+            """Write data as single precision floating point values to address.
+
+            Args:
+                address (Address): Address to write to.
+                data (Iterable[float]): Data to write, e.g. a list, array.array or numpy.ndarray.
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+            """
+            self.write_array(address, data, 'float', byteorder=byteorder)
+
         def write_double(self, address, value, *, width=8):
-            buffer = struct.pack('d', value)
+            buffer = SCALAR_STRUCTS['double'].pack(value)
             self.write(address=address, buffer=buffer, length=8, width=width)
 
+        def write_double_array(self, address, data, *, byteorder=None, width=8):
+            """Write data as double precision floating point values to address.
+
+            Args:
+                address (Address): Address to write to.
+                data (Iterable[float]): Data to write, e.g. a list, array.array or numpy.ndarray.
+                byteorder (str, optional): 'little' or 'big'. Defaults to the byte order of the host.
+                width (int, optional): Reserved.
+            """
+            self.write_array(address, data, 'double', byteorder=byteorder)
+
+    @_locked
+    def memory_cache_enable(self, *, page_size=4096, max_pages=1024):
+        self.__memory_cache = MemoryCache(page_size=page_size, max_pages=max_pages)
+        self.__memory_cache_check_state = True
+
+    @_locked
+    def memory_cache_disable(self):
+        self.__memory_cache = None
+
+    @_locked
+    def memory_cache_info(self):
+        if self.__memory_cache is None:
+            return None
+        return self.__memory_cache.info()
+
+    def __memory_read_cached(self, address, length):
+        """Read from the page cache, returns None if the read has to bypass the cache."""
+        cache = self.__memory_cache
+        if self.__memory_cache_check_state:
+            if self.get_state() != 2:  # 2 == stopped
+                return None
+            self.__memory_cache_check_state = False
+        if self.__memory_cache_check_practice:
+            if self._get_practice_state() != 0:  # 0 == not running
+                return None
+            self.__memory_cache_check_practice = False
+        access = address.access or ''
+        first_page = address.value - address.value % cache.page_size
+        pages = range(first_page, address.value + length, cache.page_size)
+        if len(pages) > cache.max_pages:
+            return None
+        data = {}
+        missing = []
+        for page in pages:
+            data[page] = cache.get(access, page)
+            if data[page] is None:
+                missing.append(page)
+        if missing:
+            results = self.memory_read_many([(Address(self, access=address.access, value=page), cache.page_size)
+                                             for page in missing])
+            for page, result in zip(missing, results):
+                if result.status != 0:
+                    # an uncached read reports the error or reads the mapped part of the page
+                    return None
+                cache.put(access, page, result.data)
+                data[page] = result.data
+        offset = address.value - first_page
+        return b''.join(data[page] for page in pages)[offset:offset + length]
+
+    def __memory_cache_invalidate_range(self, address, length):
+        if self.__memory_cache is not None:
+            self.__memory_cache.invalidate_range(address.value, length)
+
+    @_locked
     def memory_read(self, *, address: Address, length: int, width=1):
+        address = self._address(address)
+        if self.__memory_cache is not None and length > 0:
+            data = self.__memory_read_cached(address, length)
+            if data is not None:
+                return data
         self._set_channel()
-        # request
-        bufferobj_handle = ctypes.c_void_p()
-        self.__library.t32_requestbufferobj(bufferobj_handle, length)
-        c_address = CAddress(self.__library).from_address(address)
-        # execute
-        self.__library.t32_readmemoryobj(bufferobj_handle, c_address.obj, length)
-        cbuffer = (ctypes.c_uint8 * length)()
-        self.__library.t32_copydatafrombufferobj(cbuffer, length, bufferobj_handle)
-        # release
-        self.__library.t32_releasebufferobj(bufferobj_handle)
-        # return
-        return bytes(cbuffer)
-
-    def memory_write(self, *, address: Address, buffer, length, width=1):
-        # request
-        bufferobj_handle = ctypes.c_void_p()
-        self.__library.t32_requestbufferobj(bufferobj_handle, length)
-        if type(address) == str:
-            addr_match = re_addr.match(address)
-            address = Address(self, **addr_match.groupdict())
-        c_address = CAddress(self.__library).from_address(address)
-        # set
-        cbuffer = (ctypes.c_uint8 * length)(*buffer)
-        self.__library.t32_copydatatobufferobj(bufferobj_handle, length, cbuffer)
-        # execute
+        with self.__address_pool.object() as c_address, self.__buffer_pool.buffer(length) as c_buffer:
+            c_address.from_address(address)
+            # execute
+            self.__library.t32_readmemoryobj(c_buffer.obj, c_address.obj, length)
+            # return
+            return c_buffer.to_bytes(length)
+
+    @_locked
+    def memory_read_into(self, *, address: Address, buffer):
+        view = memoryview(buffer).cast('B')
+        length = len(view)
+        if length == 0:
+            return 0
+        address = self._address(address)
+        if self.__memory_cache is not None:
+            data = self.__memory_read_cached(address, length)
+            if data is not None:
+                view[:] = data
+                return length
+        self._set_channel()
+        with self.__address_pool.object() as c_address, self.__buffer_pool.buffer(length) as c_buffer:
+            c_address.from_address(address)
+            # execute
+            self.__library.t32_readmemoryobj(c_buffer.obj, c_address.obj, length)
+            # copy
+            c_buffer.copy_to(view, length)
+        return length
+
+    def memory_dump(self, *, address: Address, length: int, file, chunk_size=None, callback=None):
+        address = self._address(address)
+        if chunk_size is None:
+            chunk_size = 64 * self.__packlen
+        chunk_size = max(chunk_size - chunk_size % self.__packlen, self.__packlen)
+        if hasattr(file, 'write'):
+            fileobj = file
+        else:
+            fileobj = open(file, 'wb')
+        writer = FileWriterThread(fileobj, chunk_size)
+        writer.start()
+        start_time = time.perf_counter()
+        transferred = 0
+        try:
+            while transferred < length:
+                chunk_length = min(chunk_size, length - transferred)
+                buffer = writer.get_buffer()
+                self.memory_read_into(address=address + transferred, buffer=memoryview(buffer)[:chunk_length])
+                writer.put(buffer, chunk_length)
+                transferred += chunk_length
+                if callback is not None:
+                    elapsed = time.perf_counter() - start_time
+                    callback(TransferProgress(transferred, length, elapsed, transferred / elapsed if elapsed else 0.0))
+        except BaseException:
+            # keep the read error if the writer fails as well
+            try:
+                writer.close()
+            except Exception as e:
+                logging.debug('closing the file writer failed: {}'.format(e))
+            raise
+        else:
+            writer.close()
+        finally:
+            if fileobj is not file:
+                fileobj.close()
+        elapsed = time.perf_counter() - start_time
+        return TransferProgress(transferred, length, elapsed, transferred / elapsed if elapsed else 0.0)
+
+    def memory_load(self, *, address: Address, file, callback=None):
+        address = self._address(address)
+        if address.value > 0xFFFFFFFF:
+            raise ValueError('pipelined writes only support 32-bit addresses: {}'.format(address))
+        if isinstance(file, str):
+            with open(file, 'rb') as fileobj:
+                return self.memory_load(address=address, file=fileobj, callback=callback)
+        if hasattr(file, 'readinto'):
+            view = None
+            total = None
+            buffer = bytearray(self.__packlen)
+        else:
+            view = memoryview(file).cast('B')
+            total = len(view)
+        self._memory_cache_invalidate()
+        access = address.access.encode() if address.access else None
+        start_time = time.perf_counter()
+        transferred = 0
+        # file reads and callbacks run without the library lock, it is only taken per packet
+        try:
+            while True:
+                if view is None:
+                    chunk = memoryview(buffer)[:file.readinto(buffer)]
+                else:
+                    chunk = view[transferred:transferred + self.__packlen]
+                if len(chunk) == 0:
+                    break
+                with self.__library.lock:
+                    self._set_channel()
+                    if access is not None:
+                        # other debuggers may have changed the access class in between
+                        self.__library.t32_setmemoryaccessclass(access)
+                    # 0 == T32_MEMORY_ACCESS_DATA, the access class is set with T32_SetMemoryAccessClass
+                    self.__library.t32_writememorypipe(address.value + transferred, 0, c_uint8_array(chunk),
+                                                       len(chunk))
+                transferred += len(chunk)
+                if callback is not None:
+                    elapsed = time.perf_counter() - start_time
+                    callback(TransferProgress(transferred, total, elapsed, transferred / elapsed if elapsed else 0.0))
+            with self.__library.lock:
+                self._set_channel()
+                # a write with size 0 waits for the pipe to drain and returns the collected error state
+                self.__library.t32_writememorypipe(0, 0, None, 0)
+        finally:
+            if access is not None:
+                with self.__library.lock:
+                    self._set_channel()
+                    # the API cannot query the access class, this is the only place that sets it, so the previous
+                    # class is always the default, which an empty string restores
+                    self.__library.t32_setmemoryaccessclass(b'')
+        elapsed = time.perf_counter() - start_time
+        return TransferProgress(transferred, transferred, elapsed, transferred / elapsed if elapsed else 0.0)
+
+    @_locked
+    def memory_read_many(self, entries):
+        entries = [(self._address(address), length) for address, length in entries]
+        buffers = [bytearray(length) for _, length in entries]
+        statuses = [0] * len(entries)
+        self._set_channel()
+        for bundle in bundle_schedule([length for _, length in entries], self.__packlen):
+            # the API cannot clear a bundle for reuse, so each one is released as soon as its results are copied
+            c_bundle = CMemoryBundle(self.__library)
+            c_addresses = []
+            try:
+                for index, offset, length in bundle:
+                    c_addresses.append(self.__address_pool.acquire())
+                    c_bundle.add_read(c_addresses[-1].from_address(entries[index][0] + offset), length)
+                c_bundle.transfer()
+                for bundle_index, (index, offset, length) in enumerate(bundle):
+                    status = c_bundle.sync_status(bundle_index)
+                    if status != 0:
+                        if statuses[index] == 0:
+                            statuses[index] = status
+                        continue
+                    c_bundle.copy_data(bundle_index, buffers[index], offset, length)
+            finally:
+                for c_address in c_addresses:
+                    self.__address_pool.release(c_address)
+                c_bundle.release()
+        return [MemoryReadResult(None, status) if status != 0 else MemoryReadResult(bytes(buffer), 0)
+                for buffer, status in zip(buffers, statuses)]
+
+    @_locked
+    def memory_write_many(self, entries):
+        entries = [(self._address(address), memoryview(data).cast('B')) for address, data in entries]
+        for address, data in entries:
+            self.__memory_cache_invalidate_range(address, len(data))
+        statuses = [0] * len(entries)
+        self._set_channel()
+        for bundle in bundle_schedule([len(data) for _, data in entries], self.__packlen):
+            # the API cannot clear a bundle for reuse, so each one is released as soon as its status is read
+            c_bundle = CMemoryBundle(self.__library)
+            c_addresses = []
+            try:
+                for index, offset, length in bundle:
+                    address, data = entries[index]
+                    c_addresses.append(self.__address_pool.acquire())
+                    c_bundle.add_write(c_addresses[-1].from_address(address + offset), data[offset:offset + length])
+                c_bundle.transfer()
+                for bundle_index, (index, offset, length) in enumerate(bundle):
+                    status = c_bundle.sync_status(bundle_index)
+                    if status != 0 and statuses[index] == 0:
+                        statuses[index] = status
+            finally:
+                for c_address in c_addresses:
+                    self.__address_pool.release(c_address)
+                c_bundle.release()
+        return statuses
+
+    def memory_read_tolerant(self, *, address: Address, length: int, granularity=256, block_size=0x1000):
+        if granularity <= 0 or block_size <= 0 or block_size % granularity != 0:
+            raise ValueError('block_size must be a positive multiple of granularity')
+        address = self._address(address)
+        invalid_regions = self.__invalid_regions.setdefault(address.access or '', IntervalSet())
+        start = address.value
+        end = start + length
+        first_granule = start - start % granularity
+        data = bytearray(length)
+        valid = bytearray(b'\x01') * ((end - first_granule + granularity - 1) // granularity)
+
+        def mark_invalid(invalid_start, invalid_stop):
+            for index in range((max(invalid_start, start) - first_granule) // granularity,
+                               (min(invalid_stop, end) - 1 - first_granule) // granularity + 1):
+                valid[index] = 0
+
+        for region_start, region_stop in invalid_regions:
+            if region_start < end and region_stop > start:
+                mark_invalid(region_start, region_stop)
+        pending = []
+        for block_start in range(start - start % block_size, end, block_size):
+            pending.extend(invalid_regions.gaps(max(block_start, start), min(block_start + block_size, end)))
+        while pending:
+            results = self.memory_read_many([(Address(self, access=address.access, value=block_start),
+                                              block_stop - block_start) for block_start, block_stop in pending])
+            failed = [block for block, result in zip(pending, results) if result.status != 0]
+            for (block_start, block_stop), result in zip(pending, results):
+                if result.status == 0:
+                    data[block_start - start:block_stop - start] = result.data
+            pending = []
+            for block_start, block_stop in failed:
+                granule_start = block_start - block_start % granularity
+                granules = (block_stop - granule_start + granularity - 1) // granularity
+                if granules == 1:
+                    invalid_regions.add(granule_start, granule_start + granularity)
+                    mark_invalid(block_start, block_stop)
+                else:
+                    middle = granule_start + granules // 2 * granularity
+                    pending.extend([(block_start, middle), (middle, block_stop)])
+        return TolerantReadResult(bytes(data), bytes(valid))
+
+    def memory_clear_invalid_regions(self):
+        self.__invalid_regions.clear()
+
+    def memory_find(self, *, pattern, start: Address, end, mask=None, max_hits=None):
+        if isinstance(pattern, str):
+            pattern = pattern.encode()
+        pattern = bytes(pattern)
+        if mask is not None and len(mask) != len(pattern):
+            raise ValueError('mask and pattern must have the same length')
+        start = self._address(start)
+        end = end.value if isinstance(end, Address) else end
+        if not pattern or end - start.value < len(pattern) or max_hits == 0:
+            return []
+        try:
+            return self.__memory_find_debugger(pattern, start, end, mask, max_hits)
+        except (ExecuteCommandError, ExecuteFunctionError):
+            logging.debug('Data.Find failed, scanning locally')
+        return self.__memory_find_local(pattern, start, end, mask, max_hits)
+
+    @_locked
+    def __memory_find_debugger(self, pattern, start, end, mask, max_hits):
+        if mask is None:
+            values = ['0x{:02x}'.format(value) for value in pattern]
+        else:
+            # binary literals with don't care bits
+            values = ['0y' + ''.join('{:08b}'.format(value)[i] if '{:08b}'.format(bits)[i] == '1' else 'x'
+                                     for i in range(8)) for value, bits in zip(pattern, mask)]
         self._set_channel()
-        self.__library.t32_writememoryobj(bufferobj_handle, c_address.obj, length)
-        # release
-        self.__library.t32_releasebufferobj(bufferobj_handle)
+        # Data.Find only reads memory, cached pages stay valid
+        self.__cmd('Data.Find {}++0x{:x} %Byte {}'.format(start, end - start.value - 1, ' '.join(values)),
+                   invalidate=False)
+        hits = []
+        while self._fnc('FOUND()'):
+            hits.append(Address(self, access=start.access, value=self._fnc('ADDRESS.OFFSET(TRACK.ADDRESS())')))
+            if max_hits is not None and len(hits) >= max_hits:
+                break
+            # Data.Find without arguments continues after the last hit
+            self.__cmd('Data.Find', invalidate=False)
+        return hits
+
+    def __memory_find_local(self, pattern, start, end, mask, max_hits):
+        chunk_size = max(64 * self.__packlen, 2 * len(pattern))
+        buffer = bytearray(chunk_size)
+        hits = []
+        offset = start.value
+        while end - offset >= len(pattern):
+            length = min(chunk_size, end - offset)
+            view = memoryview(buffer)[:length]
+            self.memory_read_into(address=Address(self, access=start.access, value=offset), buffer=view)
+            for position in find_pattern(view, pattern, mask):
+                hits.append(Address(self, access=start.access, value=offset + position))
+                if max_hits is not None and len(hits) >= max_hits:
+                    return hits
+            # consecutive chunks overlap so that hits on chunk boundaries are found
+            offset += length - len(pattern) + 1
+        return hits
+
+    @_locked
+    def memory_fill(self, *, address: Address, length: int, pattern):
+        if isinstance(pattern, int):
+            pattern = bytes([pattern])
+        if not pattern:
+            raise ValueError('empty pattern')
+        if length <= 0:
+            raise ValueError('length must be positive')
+        address = self._address(address)
+        self.__memory_cache_invalidate_range(address, length)
+        self._set_channel()
+        self.__cmd('Data.Set {}++0x{:x} %Byte {}'.format(
+            address, length - 1, ' '.join('0x{:02x}'.format(value) for value in pattern)), invalidate=False)
+
+    @_locked
+    def memory_copy(self, *, address: Address, length: int, destination: Address):
+        if length <= 0:
+            raise ValueError('length must be positive')
+        address = self._address(address)
+        destination = self._address(destination)
+        self.__memory_cache_invalidate_range(destination, length)
+        self._set_channel()
+        self.__cmd('Data.COPY {}++0x{:x} {}'.format(address, length - 1, destination), invalidate=False)
+
+    @_locked
+    def memory_test(self, *, address: Address, length: int, pattern=None):
+        options = {None: '', 'prime': ' /Prime', 'random': ' /RANDOM', 'toggle': ' /Toggle'}
+        if pattern not in options:
+            raise ValueError('invalid pattern: {}'.format(pattern))
+        if length <= 0:
+            raise ValueError('length must be positive')
+        address = self._address(address)
+        self.__memory_cache_invalidate_range(address, length)
+        self._set_channel()
+        self.__cmd('Data.Test {}++0x{:x}{}'.format(address, length - 1, options[pattern]), invalidate=False)
+        if not self._fnc('FOUND()'):
+            return MemoryTestResult(True, None)
+        error_address = Address(self, access=address.access, value=self._fnc('ADDRESS.OFFSET(TRACK.ADDRESS())'))
+        return MemoryTestResult(False, error_address)
+
+    def memory_load_delta(self, *, address: Address, file, block_size=0x10000, manifest=None):
+        if block_size <= 0:
+            raise ValueError('block_size must be positive')
+        if isinstance(file, str):
+            with open(file, 'rb') as fileobj:
+                return self.memory_load_delta(address=address, file=fileobj, block_size=block_size,
+                                              manifest=manifest)
+        image = memoryview(file.read() if hasattr(file, 'read') else file).cast('B')
+        address = self._address(address)
+        key = (address.access or '', address.value)
+        offsets = range(0, len(image), block_size)
+        checksums = [zlib.crc32(image[offset:offset + block_size]) for offset in offsets]
+        previous = self.__load_manifests.get(key)
+        if previous is None and manifest is not None:
+            try:
+                with open(manifest, 'r') as fileobj:
+                    previous = json.load(fileobj).get('{}:0x{:x}'.format(*key))
+            except FileNotFoundError:
+                previous = None
+        if (previous is not None and previous['block_size'] == block_size and previous['length'] == len(image)
+                and self.memory_checksums(address=address, length=len(image), block_size=len(image) or 1)
+                == [previous['checksum']]):
+            # memory still contains the previous image
+            target_checksums = previous['blocks']
+        else:
+            target_checksums = self.memory_checksums(address=address, length=len(image), block_size=block_size)
+        entries = [(address + offset, image[offset:offset + block_size])
+                   for offset, checksum, target_checksum in zip(offsets, checksums, target_checksums)
+                   if checksum != target_checksum]
+        for status in self.memory_write_many(entries):
+            if status != 0:
+                raise_error(status)
+        self.__load_manifests[key] = {'block_size': block_size, 'length': len(image),
+                                      'checksum': zlib.crc32(image), 'blocks': checksums}
+        if manifest is not None:
+            try:
+                with open(manifest, 'r') as fileobj:
+                    manifests = json.load(fileobj)
+            except FileNotFoundError:
+                manifests = {}
+            manifests['{}:0x{:x}'.format(*key)] = self.__load_manifests[key]
+            with open(manifest, 'w') as fileobj:
+                json.dump(manifests, fileobj)
+        return DeltaLoadResult(len(checksums), len(entries), sum(len(data) for _, data in entries))
+
+    def memory_verify(self, *, address: Address, file, block_size=0x10000):
+        if block_size <= 0:
+            raise ValueError('block_size must be positive')
+        if isinstance(file, str):
+            with open(file, 'rb') as fileobj:
+                return self.memory_verify(address=address, file=fileobj, block_size=block_size)
+        image = memoryview(file.read() if hasattr(file, 'read') else file).cast('B')
+        address = self._address(address)
+        checksums = self.memory_checksums(address=address, length=len(image), block_size=block_size)
+        offsets = [offset for offset, checksum in zip(range(0, len(image), block_size), checksums)
+                   if zlib.crc32(image[offset:offset + block_size]) != checksum]
+        results = self.memory_read_many([(address + offset, len(image[offset:offset + block_size]))
+                                         for offset in offsets])
+        mismatches = []
+        for offset, result in zip(offsets, results):
+            if result.status != 0:
+                raise_error(result.status)
+            expected = image[offset:offset + len(result.data)]
+            for start, stop in changed_ranges(expected, result.data):
+                mismatches.append(MemoryMismatch(address + offset + start, bytes(expected[start:stop]),
+                                                 result.data[start:stop]))
+        return mismatches
+
+    def memory_checksums(self, *, address: Address, length: int, block_size: int):
+        """CRC32 checksums of consecutive blocks computed by the debugger (Data.SUM /CRC32)."""
+        address = self._address(address)
+        checksums = []
+        for offset in range(0, length, block_size):
+            block_length = min(block_size, length - offset)
+            with self.__library.lock:
+                self._set_channel()
+                # Data.SUM only reads memory, cached pages stay valid
+                self.__cmd('Data.SUM {}++0x{:x} /CRC32'.format(address + offset, block_length - 1),
+                           invalidate=False)
+                checksums.append(self._fnc('Data.SUM()'))
+        return checksums
+
+    def memory_snapshot(self, *, address: Address, length: int, block_size=0x10000):
+        if block_size <= 0:
+            raise ValueError('block_size must be positive')
+        address = self._address(address)
+        data = bytearray(length)
+        self.memory_read_into(address=address, buffer=data)
+        checksums = self.memory_checksums(address=address, length=length, block_size=block_size)
+        return MemorySnapshot(address, data, block_size, checksums)
+
+    def memory_diff(self, *, snapshot, update=True):
+        address = snapshot.address
+        block_size = snapshot.block_size
+        checksums = self.memory_checksums(address=address, length=snapshot.length, block_size=block_size)
+        changed = [index for index, (old, new) in enumerate(zip(snapshot.checksums, checksums)) if old != new]
+        entries = [(address + index * block_size, min(block_size, snapshot.length - index * block_size))
+                   for index in changed]
+        changes = []
+        for index, result in zip(changed, self.memory_read_many(entries)):
+            if result.status != 0:
+                raise_error(result.status)
+            offset = index * block_size
+            old = snapshot.data[offset:offset + len(result.data)]
+            for start, stop in changed_ranges(old, result.data):
+                changes.append(MemoryChange(address + offset + start, bytes(old[start:stop]), result.data[start:stop]))
+            if update:
+                snapshot.data[offset:offset + len(result.data)] = result.data
+        if update:
+            snapshot.checksums[:] = checksums
+        return changes
+
+    def memory_write(self, *, address: Address, buffer, length=None, width=1):
+        try:
+            view = memoryview(buffer).cast('B')
+        except TypeError:
+            # lists or tuples of byte values
+            view = memoryview(bytes(buffer))
+        if length is None:
+            length = len(view)
+        elif length > len(view):
+            raise ValueError('length {} exceeds buffer size {}'.format(length, len(view)))
+        if length == 0:
+            return
+        address = self._address(address)
+        # large buffers are written in chunks of the packet length, the library lock is taken per chunk
+        chunk_size = min(length, self.__packlen)
+        for offset in range(0, length, chunk_size):
+            chunk = view[offset:min(offset + chunk_size, length)]
+            with self.__library.lock:
+                self.__memory_cache_invalidate_range(address + offset, len(chunk))
+                self._set_channel()
+                with self.__address_pool.object() as c_address, self.__buffer_pool.buffer(chunk_size) as c_buffer:
+                    # set
+                    c_address.from_address(address + offset)
+                    c_buffer.copy_from(chunk)
+                    # execute
+                    self.__library.t32_writememoryobj(c_buffer.obj, c_address.obj, len(chunk))
 
     class AddressService:
         def __init__(self, parent):
@@ -942,23 +2407,26 @@ class Debugger:
             """
             return self.__parent._breakpoint_list()
 
+    @_locked
     def _breakpoint_delete(self, bp):
         self._set_channel()
         c_bp = CBreakpoint.from_breakpoint(bp, self.library)
         c_bp.write()
 
+    @_locked
     def _breakpoint_list(self):
         self._set_channel()
         c_bp_count = ctypes.c_uint32()
         self.__library.t32_querybreakpointobjcount(c_bp_count)
         bp_count = c_bp_count.value
         bps = []
-        for bp_i in range(bp_count):
-            c_bp = CBreakpoint(self.__library).read_by_index(bp_i)
-            bp = c_bp.to_breakpoint(self)
-            bps.append(bp)
+        with self.__breakpoint_pool.object() as c_bp:
+            for bp_i in range(bp_count):
+                bp = c_bp.read_by_index(bp_i).to_breakpoint(self)
+                bps.append(bp)
         return bps
 
+    @_locked
     def _breakpoint_set(self, bp):
         self._set_channel()
         c_bp = CBreakpoint.from_breakpoint(bp, self.library)
@@ -993,23 +2461,29 @@ class Debugger:
             """
             return self.__parent._symbol_query(name=name)
 
+    @_locked
     def _symbol_query(self, *, address=None, name=None):
         if address is None and name is None:
             raise ValueError('Either address or name must be set to query, but not both.')
         elif address is not None and name is not None:
             raise ValueError('Either address or name must be set to query, but not both.')
-        c_sym = CSymbol(self.__library)
-        if name is not None:
-            c_sym.name = name
-        elif address is not None:
-            c_sym.address = address
         self._set_channel()
-        self.__library.t32_querysymbolobj(c_sym.obj)
-        if c_sym.size == 0xFFFFFFFFFFFFFFFF:
-            # TODO Improve Remote API to enable better check if no symbol is found
-            return None
-        else:
-            return c_sym.to_symbol(self)
+        # T32_QuerySymbolObj fills all fields and a symbol object cannot be reset, so symbol objects are not pooled
+        c_sym = CSymbol(self.__library)
+        try:
+            with self.__address_pool.object() as c_address:
+                if name is not None:
+                    c_sym.name = name
+                elif address is not None:
+                    c_sym.set_address(c_address.from_address(self._address(address)))
+                self.__library.t32_querysymbolobj(c_sym.obj)
+                if c_sym.size == 0xFFFFFFFFFFFFFFFF:
+                    # TODO Improve Remote API to enable better check if no symbol is found
+                    return None
+                else:
+                    return c_sym.to_symbol(self, c_address)
+        finally:
+            c_sym.release()
 
     class VariableService:
         def __init__(self, parent):
@@ -1018,6 +2492,7 @@ class Debugger:
         def read(self, *args, **kwargs):
             return self.__parent.variable_read(*args, **kwargs)
 
+    @_locked
     def variable_read(self, *, name):
         self._set_channel()
         sym = self.symbol_query(name=name)
@@ -1033,6 +2508,7 @@ class Debugger:
         else:
             return mem
 
+    @_locked
     def _read_variable_value(self, variable_name):
         variable_value_ls32bit = ctypes.c_uint32()
         variable_value_ms32bit = ctypes.c_uint32()
@@ -1053,6 +2529,7 @@ class Debugger:
     #     self._set_channel()
     #     self.__library.t32_writevariablevalue(variable.get_name(), variable_value_ls32bit, variable_value_ms32bit)
 
+    @_locked
     def _read_variable_string(self, variable_name):
         c_value_size = 100
         c_value = (ctypes.c_char * c_value_size)()
@@ -1084,6 +2561,7 @@ class Debugger:
     #     """
     #     return window.update(self)
 
+    @_locked
     def t32_exp(self, cmd, data):
         T32_MAX_LINE_LEN = 16641
         self._set_channel()
@@ -1094,6 +2572,706 @@ class Debugger:
         return bytes(c_out_buf)[2:c_out_len.value]
 
 
+class DebuggerPool:
+    """Pool of connections to several TRACE32 instances.
+
+    Connections are established on first checkout and kept open after checkin, so later checkouts reuse them. A
+    checked out debugger is leased exclusively until it is checked in. Reused connections are checked with
+    t32_ping() and re-established if the check fails.
+
+    Args:
+        endpoints (Iterable[Tuple[str, int]]): (node, port) of each TRACE32 instance.
+        packlen (int, optional): Remote API packet length of the connections. Defaults to 1024.
+        timeout (float, optional): Connection establishment timeout in seconds. Defaults to 10.0.
+        strategy (ConnectStrategy, optional): Retry policy of connection establishment. Replaces timeout.
+        max_connections (int, optional): Maximum number of open connections. If the limit is reached, the least
+            recently used idle connection is closed to connect to another endpoint. Defaults to no limit.
+
+    Example:
+        >>> pool = DebuggerPool([('localhost', 20000 + i) for i in range(24)], max_connections=8)
+        >>> with pool.lease(('localhost', 20003)) as dbg:
+        ...     dbg.cmd('Go')
+    """
+    def __init__(self, endpoints, *, packlen=1024, timeout=10.0, strategy=None, max_connections=None):
+        self.__endpoints = [tuple(endpoint) for endpoint in endpoints]
+        self.__packlen = packlen
+        self.__timeout = timeout
+        self.__strategy = strategy
+        self.__max_connections = max_connections
+        self.__condition = threading.Condition()
+        self.__debuggers = {}  # endpoint -> connected Debugger
+        self.__idle = collections.OrderedDict()  # connected, not leased endpoints in LRU order
+        self.__leased = {}  # leased endpoint -> Debugger or None while connecting
+        self.__closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def endpoints(self):
+        """List[Tuple[str, int]]: Configured endpoints."""
+        return list(self.__endpoints)
+
+    @property
+    def connections(self):
+        """int: Number of open connections including connections being established."""
+        with self.__condition:
+            return len(self.__debuggers) + sum(1 for debugger in self.__leased.values() if debugger is None)
+
+    def __reserve(self, endpoint):
+        """Return (endpoint, debugger or None, debugger to close) if an endpoint can be leased, requires the lock."""
+        candidates = self.__endpoints if endpoint is None else [endpoint]
+        # prefer warm connections
+        for candidate in candidates:
+            if candidate in self.__idle:
+                del self.__idle[candidate]
+                return candidate, self.__debuggers[candidate], None
+        full = self.__max_connections is not None and self.connections >= self.__max_connections
+        for candidate in candidates:
+            if candidate in self.__leased or candidate in self.__debuggers:
+                continue
+            if not full:
+                return candidate, None, None
+            if self.__idle:
+                evicted, _ = self.__idle.popitem(last=False)
+                return candidate, None, self.__debuggers.pop(evicted)
+            break
+        return None
+
+    def checkout(self, endpoint=None, *, timeout=None):
+        """Lease a connected debugger.
+
+        Args:
+            endpoint (Tuple[str, int], optional): (node, port) of the TRACE32 instance. Defaults to any endpoint,
+                endpoints with an open connection are preferred.
+            timeout (float, optional): Seconds to wait for a free endpoint. Defaults to waiting forever.
+
+        Returns:
+            Debugger: Debugger leased to the caller until checkin().
+        """
+        if endpoint is not None:
+            endpoint = tuple(endpoint)
+            if endpoint not in self.__endpoints:
+                raise ValueError('unknown endpoint: {}'.format(endpoint))
+        with self.__condition:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                if self.__closed:
+                    raise RuntimeError('pool is closed')
+                reservation = self.__reserve(endpoint)
+                if reservation is not None:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0.0:
+                    raise TimeoutError('no free endpoint')
+                self.__condition.wait(remaining)
+            endpoint, debugger, evicted = reservation
+            self.__leased[endpoint] = debugger
+        try:
+            if evicted is not None:
+                self.__disconnect(evicted)
+            if debugger is not None:
+                try:
+                    debugger.t32_ping()
+                except ApiBaseError:
+                    logging.debug('health check of {}:{} failed, reconnecting'.format(*endpoint))
+                    self.__disconnect(debugger)
+                    with self.__condition:
+                        del self.__debuggers[endpoint]
+                        self.__leased[endpoint] = None
+                    debugger = None
+            if debugger is None:
+                node, port = endpoint
+                debugger = Debugger(node=node, port=port, packlen=self.__packlen, timeout=self.__timeout,
+                                    strategy=self.__strategy)
+        except BaseException:
+            with self.__condition:
+                del self.__leased[endpoint]
+                self.__debuggers.pop(endpoint, None)
+                self.__condition.notify_all()
+            raise
+        with self.__condition:
+            self.__debuggers[endpoint] = debugger
+            self.__leased[endpoint] = debugger
+        return debugger
+
+    def checkin(self, debugger):
+        """Return a leased debugger to the pool, the connection stays open."""
+        with self.__condition:
+            for endpoint, leased in self.__leased.items():
+                if leased is debugger:
+                    break
+            else:
+                raise ValueError('debugger is not leased from this pool')
+            del self.__leased[endpoint]
+            if self.__closed:
+                del self.__debuggers[endpoint]
+            else:
+                self.__idle[endpoint] = None
+            self.__condition.notify_all()
+        if self.__closed:
+            self.__disconnect(debugger)
+
+    @contextlib.contextmanager
+    def lease(self, endpoint=None, *, timeout=None):
+        """Context manager that checks out a debugger and checks it in again.
+
+        Args:
+            endpoint (Tuple[str, int], optional): (node, port) of the TRACE32 instance. Defaults to any endpoint.
+            timeout (float, optional): Seconds to wait for a free endpoint. Defaults to waiting forever.
+        """
+        debugger = self.checkout(endpoint, timeout=timeout)
+        try:
+            yield debugger
+        finally:
+            self.checkin(debugger)
+
+    def close(self):
+        """Close all idle connections, leased connections are closed on checkin."""
+        with self.__condition:
+            self.__closed = True
+            debuggers = [self.__debuggers.pop(endpoint) for endpoint in self.__idle]
+            self.__idle.clear()
+            self.__condition.notify_all()
+        for debugger in debuggers:
+            self.__disconnect(debugger)
+
+    @staticmethod
+    def __disconnect(debugger):
+        try:
+            debugger.disconnect()
+        except ApiBaseError as e:
+            logging.debug('disconnect failed: {}'.format(e))
+
+
+FanOutResult = collections.namedtuple('FanOutResult', ['endpoint', 'result', 'exception'])
+
+
+def run_operations(debugger, operations):
+    """Run a sequence of debugger operations.
+
+    Args:
+        debugger (Debugger): Debugger to run the operations on.
+        operations (Iterable[Tuple]): One (name, *args) tuple per operation. name is the attribute path of the
+            method, e.g. 'cmd', 'fnc' or 'memory.read'. If the last argument is a dict, it is passed as keyword
+            arguments.
+
+    Returns:
+        list: Result of each operation.
+    """
+    results = []
+    for operation in operations:
+        name, args = operation[0], list(operation[1:])
+        kwargs = args.pop() if args and isinstance(args[-1], dict) else {}
+        method = debugger
+        for attribute in name.split('.'):
+            method = getattr(method, attribute)
+        results.append(method(*args, **kwargs))
+    return results
+
+
+def _fan_out_worker(endpoint, function, args, kwargs, t32sys, packlen, timeout, strategy):
+    # no version banner per worker
+    _init_library(t32sys)
+    node, port = endpoint
+    debugger = connect(node=node, port=port, packlen=packlen, timeout=timeout, strategy=strategy)
+    try:
+        if callable(function):
+            return function(debugger, *args, **kwargs)
+        return run_operations(debugger, function)
+    finally:
+        debugger.disconnect()
+
+
+def fan_out(endpoints, function, *args, t32sys=None, packlen=1024, timeout=10.0, strategy=None, max_workers=None,
+            **kwargs):
+    """Run a function on several debuggers in parallel worker processes.
+
+    Each worker process initializes the module and connects to its endpoint, so the debuggers do not share a
+    library or channel.
+
+    Args:
+        endpoints (Iterable[Tuple[str, int]]): (node, port) of each TRACE32 instance.
+        function (Callable or Iterable[Tuple]): Picklable callable called with the connected Debugger followed by
+            args and kwargs, e.g. a module level function. Alternatively a sequence of operations as accepted by
+            run_operations().
+        t32sys (str, optional): TRACE32 system directory passed to init() in the workers.
+        packlen (int, optional): Remote API packet length. Defaults to 1024.
+        timeout (float, optional): Connection establishment timeout in seconds. Defaults to 10.0.
+        strategy (ConnectStrategy, optional): Retry policy of connection establishment. Replaces timeout.
+        max_workers (int, optional): Maximum number of worker processes. Defaults to one per endpoint.
+
+    Returns:
+        List[FanOutResult]: (endpoint, result, exception) per endpoint in the order of endpoints. exception is None
+        on success.
+
+    Example:
+        >>> def flash(dbg, image):
+        ...     dbg.cmm('flash.cmm {}'.format(image))
+        >>> fan_out([('localhost', 20000 + i) for i in range(24)], flash, 'app.elf')
+    """
+    endpoints = [tuple(endpoint) for endpoint in endpoints]
+    if not endpoints:
+        return []
+    if not callable(function):
+        function = list(function)
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers or len(endpoints)) as executor:
+        futures = [executor.submit(_fan_out_worker, endpoint, function, args, kwargs, t32sys, packlen, timeout,
+                                   strategy)
+                   for endpoint in endpoints]
+        for endpoint, future in zip(endpoints, futures):
+            exception = future.exception()
+            results.append(FanOutResult(endpoint, None if exception is not None else future.result(), exception))
+    return results
+
+
+class _AsyncService:
+    """Awaitable proxy of a Debugger service, methods run on the thread of the AsyncDebugger."""
+    def __init__(self, connection, service):
+        self.__connection = connection
+        self.__service = service
+
+    def __getattr__(self, name):
+        attribute = getattr(self.__service, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def method(*args, **kwargs):
+            return await self.__connection.run(attribute, *args, **kwargs)
+        return method
+
+    async def __call__(self, *args, **kwargs):
+        return await self.__connection.run(self.__service, *args, **kwargs)
+
+
+class AsyncDebugger:
+    """asyncio interface of a Debugger.
+
+    The calls of a debugger are serialized on a dedicated thread, so the event loop is not blocked. Calls of
+    different debuggers run on different threads. They still take turns on the API lock because the library has a
+    single channel, so use fan_out() to access many debuggers in parallel.
+
+    Every awaitable is subject to the timeout given at construction, use asyncio.wait_for() for individual timeouts.
+    A call that is cancelled or times out before its thread picked it up is not executed. A running API call cannot
+    be interrupted and completes in the background.
+
+    Args:
+        debugger (Debugger): Connected debugger.
+        timeout (float, optional): Timeout in seconds of every call. Defaults to no timeout.
+
+    Attributes:
+        breakpoint: Awaitable BreakpointService.
+        memory: Awaitable MemoryService.
+        practice: Awaitable PracticeService.
+        register: Awaitable RegisterService.
+        symbol: Awaitable SymbolService.
+        variable: Awaitable VariableService.
+
+    Example:
+        >>> async with await AsyncDebugger.connect(port=20000, timeout=5.0) as dbg:
+        ...     await dbg.cmd('Go')
+        ...     await dbg.wait_stopped(timeout=10.0)
+        ...     data = await dbg.memory.read(address='D:0x1000', length=16)
+    """
+    def __init__(self, debugger, *, timeout=None):
+        self.__debugger = debugger
+        self.__timeout = timeout
+        self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.breakpoint = _AsyncService(self, debugger.breakpoint)
+        self.memory = _AsyncService(self, debugger.memory)
+        self.practice = _AsyncService(self, debugger.practice)
+        self.register = _AsyncService(self, debugger.register)
+        self.symbol = _AsyncService(self, debugger.symbol)
+        self.variable = _AsyncService(self, debugger.variable)
+
+    @classmethod
+    async def connect(cls, *, node='localhost', port=20000, packlen=1024, timeout=None, connect_timeout=10.0,
+                      strategy=None):
+        """Connect to a debugger without blocking the event loop.
+
+        Args:
+            node (str): Remote API node. Defaults to 'localhost'.
+            port (int): Remote API port. Defaults to 20000.
+            packlen (int): Remote API packet length. Defaults to 1024.
+            timeout (float, optional): Timeout in seconds of every call. Defaults to no timeout.
+            connect_timeout (float, optional): Connection establishment timeout in seconds. Defaults to 10.0.
+            strategy (ConnectStrategy, optional): Retry policy of connection establishment. Replaces
+                connect_timeout.
+
+        Returns:
+            AsyncDebugger: Result
+        """
+        loop = asyncio.get_event_loop()
+        debugger = await loop.run_in_executor(None, functools.partial(
+            Debugger, node=node, port=port, packlen=packlen, timeout=connect_timeout, strategy=strategy))
+        return cls(debugger, timeout=timeout)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @property
+    def debugger(self):
+        """Debugger: The wrapped debugger. Calling it directly blocks the event loop."""
+        return self.__debugger
+
+    async def run(self, function, *args, **kwargs):
+        """Run a blocking function on the thread of this debugger.
+
+        Args:
+            function (Callable): Function to run, e.g. a method of the debugger.
+
+        Returns:
+            Result of the function.
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.run_in_executor(self.__executor, functools.partial(function, *args, **kwargs))
+        return await asyncio.wait_for(future, self.__timeout)
+
+    async def close(self):
+        """Disconnect and stop the thread of this debugger."""
+        try:
+            await self.run(self.__debugger.disconnect)
+        finally:
+            self.__executor.shutdown(wait=False)
+
+    async def cmd(self, command):
+        return await self.run(self.__debugger.cmd, command)
+
+    async def fnc(self, command):
+        return await self.run(self.__debugger.fnc, command)
+
+    async def cmm(self, cmd, **kwargs):
+        return await self.run(self.__debugger.cmm, cmd, **kwargs)
+
+    async def cmd_int(self, cmd):
+        return await self.run(self.__debugger.cmd_int, cmd)
+
+    async def cmd_str(self, cmd):
+        return await self.run(self.__debugger.cmd_str, cmd)
+
+    async def get_state(self):
+        return await self.run(self.__debugger.get_state)
+
+    async def go(self):
+        await self.run(self.__debugger.go)
+
+    async def break_(self):
+        await self.run(self.__debugger.break_)
+
+    async def step(self):
+        await self.run(self.__debugger.step)
+
+    async def step_over(self):
+        await self.run(self.__debugger.step_over)
+
+    async def t32_ping(self):
+        await self.run(self.__debugger.t32_ping)
+
+    async def wait_state(self, *states, poll_interval=0.1, timeout=None):
+        """Wait until the target is in one of the states.
+
+        Args:
+            states (int): Target states, 0 == down, 1 == halted, 2 == stopped, 3 == running.
+            poll_interval (float, optional): Seconds between state checks. Defaults to 0.1.
+            timeout (float, optional): Seconds to wait. Defaults to waiting forever.
+
+        Returns:
+            int: Reached state.
+        """
+        async def poll():
+            while True:
+                state = await self.get_state()
+                if state in states:
+                    return state
+                await asyncio.sleep(poll_interval)
+        return await asyncio.wait_for(poll(), timeout)
+
+    async def wait_stopped(self, *, poll_interval=0.1, timeout=None):
+        """Wait until the target has stopped, e.g. at a breakpoint."""
+        return await self.wait_state(2, poll_interval=poll_interval, timeout=timeout)
+
+    async def wait_running(self, *, poll_interval=0.1, timeout=None):
+        """Wait until the target is running."""
+        return await self.wait_state(3, poll_interval=poll_interval, timeout=timeout)
+
+
+class _ResilientService:
+    """Proxy of a Debugger service whose methods reconnect on transport failures."""
+    def __init__(self, session, service, *, idempotent=False):
+        self._session = session
+        self._service = service
+        self.__idempotent = idempotent
+
+    def __getattr__(self, name):
+        attribute = getattr(self._service, name)
+        if not callable(attribute):
+            return attribute
+        idempotent = self._session.is_idempotent(name)
+
+        @functools.wraps(attribute)
+        def method(*args, **kwargs):
+            return self._session.call(attribute, *args, idempotent=idempotent, **kwargs)
+        return method
+
+    def __call__(self, *args, **kwargs):
+        return self._session.call(self._service, *args, idempotent=self.__idempotent, **kwargs)
+
+
+class _ResilientBreakpointService(_ResilientService):
+    def set(self, *args, **kwargs):
+        """Set a breakpoint and register it for restore."""
+        bp = self._session.call(self._service.set, *args, idempotent=True, **kwargs)
+        self._session.add_breakpoint(bp)
+        return bp
+
+    def delete(self, bp):
+        """Delete a breakpoint and unregister it."""
+        self._session.remove_breakpoint(bp)
+        self._session.call(bp.delete, idempotent=True)
+
+
+class _ResilientPracticeService(_ResilientService):
+    def set_macro(self, name, value):
+        """Set a (global) PRACTICE macro and register it for restore."""
+        self._session.call(self._service.set_macro, name, value, idempotent=True)
+        self._session.add_macro(name, value)
+
+
+class ResilientDebugger:
+    """Debugger that survives transport failures.
+
+    If a call fails with ApiReceiveFail or ApiTransmitFail, e.g. because TRACE32 was restarted or the link dropped,
+    the connection is re-established with the original node, port and packet length, retried with the connect
+    strategy of the debugger. The registered session state is replayed in this order: setup commands, PRACTICE
+    macros, breakpoints and restore callbacks. Read-only operations, see is_idempotent(), are then retried. Other
+    operations such as cmd(), go(), step() or memory writes re-raise the error after reconnecting because they may
+    have taken effect before the failure, use call() with idempotent=True to retry them anyway.
+
+    Breakpoints set with breakpoint.set() and macros set with practice.set_macro() are registered automatically.
+    Delete registered breakpoints with breakpoint.delete(), enable() and disable() of a registered breakpoint are
+    honored on restore.
+
+    Args:
+        debugger (Debugger): Connected debugger. Other references to it stay valid because it is reconnected in
+            place.
+        max_retries (int, optional): Maximum number of retries of an idempotent operation. Defaults to 3.
+
+    Attributes:
+        breakpoint: BreakpointService that registers breakpoints.
+        memory: MemoryService.
+        practice: PracticeService that registers macros.
+        register: RegisterService.
+        symbol: SymbolService.
+        variable: VariableService.
+
+    Example:
+        >>> dbg = ResilientDebugger.connect(port=20000, strategy=ConnectStrategy(timeout=120.0))
+        >>> dbg.setup('SYStem.MemAccess DAP')
+        >>> dbg.breakpoint.set(address=dbg.address.from_string('P:0x1000'))
+        >>> data = dbg.memory.read(address='D:0x1000', length=16)
+    """
+    # names of the Debugger and service methods that only read state and return their complete result, so they
+    # can be repeated safely. Writes are not included because memory-mapped registers such as FIFOs or
+    # write-1-to-clear bits change state when written twice.
+    IDEMPOTENT_NAMES = frozenset([
+        # Debugger
+        'fnc', '_fnc', 'get_state', 't32_ping', 'memory_read', 'memory_read_into', 'memory_read_many',
+        'memory_read_tolerant', 'memory_find', 'memory_verify', 'memory_checksums', 'memory_snapshot',
+        'memory_cache_info', 'variable_read', '_symbol_query', '_breakpoint_list',
+        # MemoryService
+        'read', 'read_into', 'read_many', 'read_array', 'read_struct', 'read_tolerant', 'find', 'verify', 'snapshot',
+        'cache_info', 'read_int8', 'read_int8_array', 'read_uint8', 'read_uint8_array', 'read_int16',
+        'read_int16_array', 'read_uint16', 'read_uint16_array', 'read_int32', 'read_int32_array', 'read_uint32',
+        'read_uint32_array', 'read_int64', 'read_int64_array', 'read_uint64', 'read_uint64_array', 'read_float',
+        'read_float_array', 'read_double', 'read_double_array',
+        # RegisterService
+        'read_by_names', 'read_all', 'read_list', 'read_dict_list',
+        # BreakpointService, SymbolService and PracticeService
+        'list', 'query_by_address', 'query_by_name', 'get_macro', 'set_macro',
+    ])
+
+    def __init__(self, debugger, *, max_retries=3):
+        self.__debugger = debugger
+        self.__max_retries = max_retries
+        self.__lock = threading.RLock()
+        self.__generation = 0
+        self.__reconnects = 0
+        self.__setup_commands = []
+        self.__macros = collections.OrderedDict()
+        self.__breakpoints = []
+        self.__restore_callbacks = []
+        self.address = debugger.address
+        self.breakpoint = _ResilientBreakpointService(self, debugger.breakpoint)
+        self.cmd = _ResilientService(self, debugger.cmd)
+        self.fnc = _ResilientService(self, debugger.fnc, idempotent=True)
+        self.memory = _ResilientService(self, debugger.memory)
+        self.practice = _ResilientPracticeService(self, debugger.practice)
+        self.register = _ResilientService(self, debugger.register)
+        self.symbol = _ResilientService(self, debugger.symbol)
+        self.variable = _ResilientService(self, debugger.variable)
+
+    @classmethod
+    def connect(cls, *, node='localhost', port=20000, packlen=1024, timeout=10.0, strategy=None, max_retries=3):
+        """Connect to a debugger.
+
+        Args:
+            node (str): Remote API node. Defaults to 'localhost'.
+            port (int): Remote API port. Defaults to 20000.
+            packlen (int): Remote API packet length. Defaults to 1024.
+            timeout (float): Connection establishment timeout in seconds. Defaults to 10.0.
+            strategy (ConnectStrategy, optional): Retry policy of the connection and of reconnects. Replaces
+                timeout.
+            max_retries (int, optional): Maximum number of retries of an idempotent operation. Defaults to 3.
+
+        Returns:
+            ResilientDebugger: Result
+        """
+        debugger = Debugger(node=node, port=port, packlen=packlen, timeout=timeout, strategy=strategy)
+        return cls(debugger, max_retries=max_retries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disconnect()
+
+    def __getattr__(self, name):
+        attribute = getattr(self.__debugger, name)
+        if not callable(attribute):
+            return attribute
+        idempotent = self.is_idempotent(name)
+
+        @functools.wraps(attribute)
+        def method(*args, **kwargs):
+            return self.call(attribute, *args, idempotent=idempotent, **kwargs)
+        return method
+
+    @property
+    def debugger(self):
+        """Debugger: Wrapped debugger."""
+        return self.__debugger
+
+    @property
+    def reconnects(self):
+        """int: Number of reconnects so far."""
+        return self.__reconnects
+
+    def is_idempotent(self, name):
+        """Whether the operation of the given method name is retried after a reconnect, see IDEMPOTENT_NAMES.
+
+        Use call() with idempotent=True to retry other operations, e.g. writes to plain RAM.
+        """
+        return name in self.IDEMPOTENT_NAMES
+
+    def call(self, function, *args, idempotent=False, **kwargs):
+        """Call a function, reconnect on transport failures and retry it if it is idempotent.
+
+        Args:
+            function (Callable): Function accessing the debugger.
+            idempotent (bool, optional): Retry the call after a reconnect. Defaults to False.
+
+        Returns:
+            Result of the function.
+        """
+        retries = 0
+        while True:
+            generation = self.__generation
+            try:
+                return function(*args, **kwargs)
+            except (ApiReceiveFail, ApiTransmitFail) as e:
+                logging.warning('transport failure: {}, reconnecting'.format(type(e).__name__))
+                self.__reconnect(generation)
+                if not idempotent or retries >= self.__max_retries:
+                    raise
+                retries += 1
+
+    def reconnect(self):
+        """Re-establish the connection and replay the registered session state."""
+        self.__reconnect(self.__generation)
+
+    def __reconnect(self, generation):
+        with self.__lock:
+            if generation != self.__generation:
+                # another thread already reconnected after this call failed
+                return
+            retries = 0
+            while True:
+                self.__debugger.reconnect()
+                try:
+                    self.__restore()
+                    break
+                except (ApiReceiveFail, ApiTransmitFail):
+                    if retries >= self.__max_retries:
+                        raise
+                    retries += 1
+            self.__generation += 1
+            self.__reconnects += 1
+
+    def __restore(self):
+        for command in self.__setup_commands:
+            self.__debugger.cmd(command)
+        for name, value in self.__macros.items():
+            self.__debugger.practice.set_macro(name, value)
+        for bp in self.__breakpoints:
+            bp.set()
+        for callback in self.__restore_callbacks:
+            callback(self.__debugger)
+
+    def setup(self, command):
+        """Execute a command and replay it after every reconnect.
+
+        Use it for settings that are lost when TRACE32 restarts, e.g. memory access settings
+        ('SYStem.MemAccess DAP', 'MAP.BUS32 D:0x40000000--0x4fffffff') or an initialization script
+        ('DO init.cmm'). Commands are replayed in the order they were registered.
+
+        Args:
+            command (str): TRACE32 command.
+        """
+        self.call(self.__debugger.cmd, command)
+        with self.__lock:
+            self.__setup_commands.append(command)
+
+    def add_macro(self, name, value):
+        """Register a PRACTICE macro for restore, see practice.set_macro()."""
+        with self.__lock:
+            self.__macros[name] = value
+
+    def add_breakpoint(self, bp):
+        """Register a breakpoint for restore, see breakpoint.set()."""
+        with self.__lock:
+            if not any(registered is bp for registered in self.__breakpoints):
+                self.__breakpoints.append(bp)
+
+    def remove_breakpoint(self, bp):
+        """Unregister a breakpoint."""
+        with self.__lock:
+            self.__breakpoints = [registered for registered in self.__breakpoints if registered is not bp]
+
+    def add_restore_callback(self, callback):
+        """Register a callback called with the Debugger after the session state was replayed."""
+        with self.__lock:
+            self.__restore_callbacks.append(callback)
+
+    def clear_session_state(self):
+        """Unregister all setup commands, macros, breakpoints and restore callbacks."""
+        with self.__lock:
+            self.__setup_commands.clear()
+            self.__macros.clear()
+            self.__breakpoints.clear()
+            self.__restore_callbacks.clear()
+
+    def disconnect(self):
+        self.__debugger.disconnect()
+
+
 class WindowError(Exception):
     def __init__(self, error_message):
         super().__init__(error_message)